@@ -1,38 +1,254 @@
+import atexit
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
-_driver = None
+# =========================
+# 설정
+# =========================
+POOL_SIZE = int(os.environ.get("DRIVER_POOL_SIZE", 2))
+RECYCLE_AFTER = int(os.environ.get("DRIVER_RECYCLE_AFTER", 200))   # N 페이지마다 재시작 (메모리 누수 방지)
 
-def get_driver():
-    global _driver
+# 가벼운 브라우저 프로필 (이미지 ❌, 광고/통계 스크립트 ❌, DOMContentLoaded 까지만 대기)
+LEAN_BROWSER = os.environ.get("LEAN_BROWSER", "1") == "1"
 
-    if _driver is not None:
-        try:
-            _driver.title
-            return _driver
-        except:
-            _driver = None
+# CDP Network.setBlockedURLs 패턴 (* 와일드카드)
+BLOCKED_URL_PATTERNS = [
+    # 광고 / 통계
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*adservice.google.*",
+    "*facebook.net*",
+    "*scorecardresearch.com*",
+    "*criteo.*",
+    "*siape.veta.naver.com*",
+    "*tivan.naver.com*",
+    "*lcs.naver.com*",
+    "*wcs.naver.net*",
+    "*nelo2-col.navercorp.com*",
+    # 폰트 / 미디어
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*.mp4",
+]
+
+# 사이트별 예외: 도메인(접미사) → 차단하지 않을 패턴
+#   예) "blog.naver.com": ["*.woff2"]
+SITE_ALLOWLIST = {}
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def _chromedriver_path():
+    # ChromeDriverManager().install() 은 느림 → 1회만
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
 
+
+def create_driver():
     options = Options()
     options.add_argument("--headless=new")
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
     options.add_argument("--window-size=1200,900")
 
-    _driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
+    if LEAN_BROWSER:
+        options.page_load_strategy = "eager"
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+        })
+
+    driver = webdriver.Chrome(
+        service=Service(_chromedriver_path()),
         options=options
     )
-    return _driver
 
+    if LEAN_BROWSER:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+        except Exception as e:
+            print("⚠️ CDP Network.enable 실패 (차단 목록 미적용):", e)
+
+    return driver
+
+
+_applied_blocklist = weakref.WeakKeyDictionary()
+
+
+def _blocked_patterns_for(host):
+    allowed = set()
+    for suffix, patterns in SITE_ALLOWLIST.items():
+        if host == suffix or host.endswith("." + suffix):
+            allowed.update(patterns)
+    return tuple(p for p in BLOCKED_URL_PATTERNS if p not in allowed)
+
+
+def apply_site_profile(driver, url):
+    """
+    driver.get(url) 직전 호출 → 해당 사이트 기준 차단 목록 적용
+    (직전과 같으면 CDP 호출 생략)
+    """
+    if not LEAN_BROWSER:
+        return
+
+    patterns = _blocked_patterns_for(urlparse(url).hostname or "")
+    if _applied_blocklist.get(driver) == patterns:
+        return
+
+    try:
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+        _applied_blocklist[driver] = patterns
+    except Exception as e:
+        print("⚠️ 차단 목록 적용 실패:", e)
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def _is_alive(driver) -> bool:
+    try:
+        driver.title
+        return True
+    except Exception:
+        return False
 
-def quit_driver():
-    global _driver
-    if _driver:
+
+# =========================
+# 🚗 드라이버 풀
+# =========================
+class DriverPool:
+    """
+    headless Chrome N개를 미리 띄워두고 빌려주는 풀
+    - acquire / release (체크아웃 / 체크인)
+    - 체크아웃 시 헬스체크 → 죽은 인스턴스만 교체
+    - RECYCLE_AFTER 페이지마다 재시작
+    """
+
+    def __init__(self, size=POOL_SIZE, recycle_after=RECYCLE_AFTER, factory=create_driver):
+        self.size = max(1, size)
+        self.recycle_after = recycle_after
+        self._factory = factory
+
+        self._idle = []
+        self._uses = {}
+        self._created = 0
+        self._cond = threading.Condition()
+
+    def _new_driver(self):
+        try:
+            driver = self._factory()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def _discard(self, driver):
+        _quit(driver)
+        with self._cond:
+            self._uses.pop(id(driver), None)
+            self._created -= 1
+            self._cond.notify()
+
+    def warm_up(self):
+        """풀 크기만큼 미리 실행 (첫 크롤링 콜드스타트 제거)"""
+        while True:
+            with self._cond:
+                if self._created >= self.size:
+                    return
+                self._created += 1
+
+            driver = self._new_driver()
+            with self._cond:
+                self._idle.append(driver)
+                self._cond.notify()
+
+    def acquire(self, timeout=None):
+        while True:
+            with self._cond:
+                ok = self._cond.wait_for(
+                    lambda: self._idle or self._created < self.size,
+                    timeout=timeout,
+                )
+                if not ok:
+                    raise TimeoutError("사용 가능한 드라이버 없음")
+
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    self._created += 1
+                    driver = None
+
+            if driver is None:
+                return self._new_driver()
+
+            if _is_alive(driver):
+                return driver
+
+            print("♻️ 죽은 드라이버 교체")
+            self._discard(driver)
+
+    def release(self, driver, broken=False):
+        with self._cond:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+
+        if broken:
+            print("♻️ 드라이버 오류 → 해당 인스턴스만 교체")
+            self._discard(driver)
+            return
+
+        if self.recycle_after and uses >= self.recycle_after:
+            print(f"♻️ 드라이버 {uses}페이지 사용 → 재시작")
+            self._discard(driver)
+            return
+
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def driver(self, timeout=None):
+        driver = self.acquire(timeout=timeout)
+        broken = False
         try:
-            _driver.quit()
-        except:
-            pass
-        _driver = None
\ No newline at end of file
+            yield driver
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.release(driver, broken=broken)
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver)
+
+
+driver_pool = DriverPool()
+atexit.register(driver_pool.close)
@@ -1,6 +1,9 @@
 import requests
 from bs4 import BeautifulSoup
 
+from crawler.url_classifier import CRAWLER_NAVER_CAFE, classify_url
+from utils.cafe_guard import fetch_page
+
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
 }
@@ -17,14 +20,11 @@ def get_comment_and_view(url: str) -> tuple[int, int]:
     → (댓글 수, 조회 수) 반환
     실패 시 (0, 0)
     """
-    try:
-        url = to_mobile(url)
-        res = requests.get(url, headers=HEADERS, timeout=5)
-        res.raise_for_status()
-    except Exception:
+    entry = fetch_page(to_mobile(url))
+    if entry is None or entry[0] != 200:
         return 0, 0
 
-    soup = BeautifulSoup(res.text, "html.parser")
+    soup = BeautifulSoup(entry[1], "html.parser")
 
     # =========================
     # 댓글 수
@@ -72,3 +72,156 @@ def get_comment_and_view(url: str) -> tuple[int, int]:
 
     return comment_count, view_count
 
+
+
+# =========================
+# ⚡ HTTP 전용 fast path (JSON API)
+# =========================
+ARTICLE_API = (
+    "https://apis.naver.com/cafe-web/cafe-articleapi/v2.1/"
+    "cafes/{cafe}/articles/{article_id}"
+)
+COMMENT_PAGE_API = (
+    "https://apis.naver.com/cafe-web/cafe-articleapi/v2/"
+    "cafes/{cafe}/articles/{article_id}/comments/pages/{page}"
+)
+API_HEADERS = {
+    **HEADERS,
+    "Referer": "https://m.cafe.naver.com/",
+    "Accept": "application/json",
+}
+API_TIMEOUT = 5
+MAX_COMMENT_PAGES = 20
+
+# 🔑 전역 세션 (keep-alive)
+_session = requests.Session()
+_session.headers.update(API_HEADERS)
+
+def parse_cafe_url(url: str):
+    """
+    카페 게시글 URL → (cafe, article_id, use_cafe_id)
+    - cafe: clubid(숫자) 또는 카페 별칭
+    - 해석 불가 시 None
+    (파싱은 crawler.url_classifier 가 담당)
+    """
+    route = classify_url(url)
+    if route.crawler != CRAWLER_NAVER_CAFE or route.article_id is None:
+        return None
+    return route.cafe, route.article_id, route.use_cafe_id
+
+
+def _is_deleted_reason(text: str) -> bool:
+    return ("삭제" in text) or ("존재하지" in text)
+
+
+def _writer_key(writer) -> str | None:
+    if not isinstance(writer, dict):
+        return None
+    return writer.get("memberKey") or writer.get("id")
+
+
+def _fetch_comment_items(cafe, article_id, use_cafe_id, first_items, expected):
+    """
+    본문 응답에 포함된 댓글 + 부족하면 댓글 페이지 API 추가 조회
+    → 전체를 확보하지 못하면 None
+    """
+    items = list(first_items)
+    page = 2
+
+    while len(items) < expected and page <= MAX_COMMENT_PAGES:
+        res = _session.get(
+            COMMENT_PAGE_API.format(cafe=cafe, article_id=article_id, page=page),
+            params={
+                "requestFrom": "A",
+                "orderBy": "asc",
+                "useCafeId": str(use_cafe_id).lower(),
+            },
+            timeout=API_TIMEOUT,
+        )
+        if res.status_code != 200:
+            return None
+
+        more = (res.json().get("result") or {}).get("comments", {}).get("items") or []
+        if not more:
+            break
+
+        items.extend(more)
+        page += 1
+
+    if len(items) < expected:
+        return None
+    return items
+
+
+def get_comment_and_view_api(url: str):
+    """
+    네이버 카페 게시글 JSON API 로 크롤링 (Chrome 없음)
+    return: (title, total, external, view, is_deleted) 또는 None (→ Selenium fallback)
+    """
+    parsed = parse_cafe_url(url)
+    if not parsed:
+        return None
+
+    cafe, article_id, use_cafe_id = parsed
+
+    try:
+        res = _session.get(
+            ARTICLE_API.format(cafe=cafe, article_id=article_id),
+            params={
+                "query": "",
+                "useCafeId": str(use_cafe_id).lower(),
+                "requestFrom": "A",
+            },
+            timeout=API_TIMEOUT,
+        )
+
+        try:
+            data = res.json()
+        except ValueError:
+            return None
+
+        result = data.get("result") or {}
+
+        # 삭제 / 없는 글
+        if res.status_code != 200:
+            reason = str(result.get("reason") or result.get("message") or "")
+            if _is_deleted_reason(reason):
+                return "", 0, 0, 0, True
+            return None
+
+        article = result.get("article")
+        if not isinstance(article, dict):
+            return None
+
+        title = (article.get("subject") or "").strip()
+        view = int(article.get("readCount") or 0)
+        expected = int(article.get("commentCount") or 0)
+        author = _writer_key(article.get("writer"))
+
+        items = _fetch_comment_items(
+            cafe,
+            article_id,
+            use_cafe_id,
+            (result.get("comments") or {}).get("items") or [],
+            expected,
+        )
+        if items is None:
+            return None
+
+        comments = [c for c in items if not c.get("isDeleted")]
+        total = len(comments)
+        external = sum(
+            1 for c in comments
+            if not c.get("isArticleWriter")
+            and (author is None or _writer_key(c.get("writer")) != author)
+        )
+
+        print(
+            f"⚡ 결과(API) → 제목:{title} | "
+            f"전체:{total} | 외부:{external} | 조회:{view}"
+        )
+        return title, total, external, view, False
+
+    except (requests.RequestException, ValueError, TypeError, AttributeError) as e:
+        print("⚠️ API 크롤링 실패 → Selenium fallback:", e)
+        return None
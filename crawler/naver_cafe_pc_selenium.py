@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 import re
-import time
 
+from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -14,7 +14,28 @@ from selenium.common.exceptions import (
     NoAlertPresentException,
 )
 
-from crawler.driver import get_driver, quit_driver
+from crawler.driver import apply_site_profile, driver_pool
+from crawler.waits import COMMENT_WAIT_TIMEOUT, any_element_present, timed_wait
+
+class RenderError(RuntimeError):
+    """
+    Selenium 렌더링 실패 (timeout / WebDriver 오류) → 결과 없음, 다음 실행에서 재시도
+    """
+
+
+# 댓글 DOM (다중 셀렉터)
+COMMENT_SELECTORS = [
+    "li.comment_item",
+    "li.CommentItem",
+    "div.comment_box li",
+    "div.comment_area li",
+]
+# 댓글 0개인 글 → 목록 대신 댓글 영역 / 댓글 수가 렌더링되면 준비 완료
+COMMENT_READY_SELECTORS = [
+    ".CommentBox",
+    ".comment_count",
+    "a.button_comment",
+]
 
 
 # =========================
@@ -38,30 +59,72 @@ def _is_deleted_alert(text: str) -> bool:
 
 
 # =========================
-# 작성자 댓글 판별
+# 작성자 댓글 판별 (파싱된 HTML 기준 → WebDriver 호출 ❌)
 # =========================
 def _is_author_comment(comment_el) -> bool:
-    try:
-        # 1️⃣ 텍스트 기반
-        if "작성자" in comment_el.text:
-            return True
-
-        # 2️⃣ class / badge 기반
-        badges = comment_el.find_elements(
-            By.XPATH,
-            ".//*[contains(@class,'writer') or contains(@class,'author')]"
-        )
-        if badges:
-            return True
+    # 1️⃣ 텍스트 기반
+    if "작성자" in comment_el.get_text(" ", strip=True):
+        return True
 
-        # 3️⃣ aria-label
-        aria = comment_el.get_attribute("aria-label") or ""
-        if "작성자" in aria:
-            return True
+    # 2️⃣ class / badge 기반
+    if comment_el.select_one("[class*='writer'], [class*='author']"):
+        return True
 
-        return False
-    except Exception:
-        return False
+    # 3️⃣ aria-label
+    if "작성자" in (comment_el.get("aria-label") or ""):
+        return True
+
+    return False
+
+
+# =========================
+# HTML 한 번에 파싱
+# =========================
+TITLE_SELECTORS = ["h3.title_text", "strong.title_text", "div.title_text"]
+
+
+def parse_article_html(html: str):
+    """
+    cafe_main 프레임 HTML → (title, total_comment, external_comment, view)
+    댓글 수와 관계없이 page_source 1회만 사용
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    # 제목
+    title = ""
+    for sel in TITLE_SELECTORS:
+        el = soup.select_one(sel)
+        if el:
+            title = el.get_text(strip=True)
+            if title:
+                break
+
+    # 조회수
+    view = 0
+    m_view = re.search(r"조회\s*([0-9,]+)", html)
+    if m_view:
+        view = int(m_view.group(1).replace(",", ""))
+
+    # 댓글 DOM 탐색
+    comment_elements = []
+    for sel in COMMENT_SELECTORS:
+        comment_elements = soup.select(sel)
+        if comment_elements:
+            break
+
+    # 댓글 수 계산
+    if comment_elements:
+        total_comment = len(comment_elements)
+        external_comment = sum(
+            1 for c in comment_elements if not _is_author_comment(c)
+        )
+    else:
+        # fallback (DOM 못잡을 때)
+        m_comment = re.search(r"댓글\s*([0-9,]+)", html)
+        total_comment = int(m_comment.group(1).replace(",", "")) if m_comment else 0
+        external_comment = total_comment  # 작성자 구분 불가 → 전체로 처리
+
+    return title, total_comment, external_comment, view
 
 
 # =========================
@@ -77,76 +140,39 @@ def get_comment_and_view_pc(url: str):
         view: int,
         is_deleted: bool
     )
+    렌더링 실패 → RenderError (0 값으로 채운 결과 반환 ❌)
     """
-    driver = get_driver()
+    driver = driver_pool.acquire()
+    broken = False   # True → 이 인스턴스만 교체
     print("▶ 접속 URL(PC):", url)
 
     try:
         driver.set_page_load_timeout(20)
         driver.switch_to.default_content()
+        apply_site_profile(driver, url)
         driver.get(url)
 
         # alert 선처리
         alert_text = _try_accept_alert(driver)
         if alert_text:
-            if _is_deleted_alert(alert_text):
-                quit_driver()
-                return "", 0, 0, 0, True
-            quit_driver()
-            return "", 0, 0, 0, False
+            return "", 0, 0, 0, _is_deleted_alert(alert_text)
 
         wait = WebDriverWait(driver, 15)
         wait.until(EC.frame_to_be_available_and_switch_to_it((By.ID, "cafe_main")))
-        time.sleep(0.7)
 
-        html = driver.page_source
+        # 댓글 목록 또는 댓글 영역이 그려질 때까지만 대기 (timeout 이어도 진행 → fallback)
+        # 문서 로드가 끝났는데 셀렉터가 없으면 바로 진행 (셀렉터 미일치 글에서 timeout 만큼 낭비 ❌)
+        timed_wait(
+            driver,
+            any_element_present(
+                COMMENT_SELECTORS + COMMENT_READY_SELECTORS, until_ready=True
+            ),
+            COMMENT_WAIT_TIMEOUT,
+            "pc_comments",
+        )
 
-        # 제목
-        title = ""
-        for sel in ["h3.title_text", "strong.title_text", "div.title_text"]:
-            try:
-                el = driver.find_element(By.CSS_SELECTOR, sel)
-                title = el.text.strip()
-                if title:
-                    break
-            except Exception:
-                pass
-
-        # 조회수
-        view = 0
-        m_view = re.search(r"조회\s*([0-9,]+)", html)
-        if m_view:
-            view = int(m_view.group(1).replace(",", ""))
-
-        # 댓글 DOM 탐색 (다중 셀렉터)
-        COMMENT_SELECTORS = [
-            "li.comment_item",
-            "li.CommentItem",
-            "div.comment_box li",
-            "div.comment_area li",
-        ]
-
-        comment_elements = []
-        for sel in COMMENT_SELECTORS:
-            try:
-                comment_elements = driver.find_elements(By.CSS_SELECTOR, sel)
-                if comment_elements:
-                    break
-            except Exception:
-                continue
-
-        # 댓글 수 계산
-        if comment_elements:
-            total_comment = len(comment_elements)
-            external_comment = 0
-            for c in comment_elements:
-                if not _is_author_comment(c):
-                    external_comment += 1
-        else:
-            # fallback (DOM 못잡을 때)
-            m_comment = re.search(r"댓글\s*([0-9,]+)", html)
-            total_comment = int(m_comment.group(1).replace(",", "")) if m_comment else 0
-            external_comment = total_comment  # 작성자 구분 불가 → 전체로 처리
+        html = driver.page_source
+        title, total_comment, external_comment, view = parse_article_html(html)
 
         print(
             f"✅ 결과 → 제목:{title} | "
@@ -157,24 +183,21 @@ def get_comment_and_view_pc(url: str):
 
     except UnexpectedAlertPresentException:
         text = _try_accept_alert(driver)
-        if _is_deleted_alert(text):
-            quit_driver()
-            return "", 0, 0, 0, True
-        quit_driver()
-        return "", 0, 0, 0, False
+        return "", 0, 0, 0, _is_deleted_alert(text)
 
     except (TimeoutException, WebDriverException) as e:
         print("⚠️ Selenium 오류:", e)
-        quit_driver()
-        return "", 0, 0, 0, False
+        broken = True
+        raise RenderError(f"Selenium 오류: {e}") from e
 
     except Exception as e:
         print("❌ 크롤링 실패:", e)
-        quit_driver()
-        return "", 0, 0, 0, False
+        broken = True
+        raise RenderError(f"크롤링 실패: {e}") from e
 
     finally:
         try:
             driver.switch_to.default_content()
         except Exception:
-            pass
\ No newline at end of file
+            broken = True
+        driver_pool.release(driver, broken=broken)
@@ -0,0 +1,243 @@
+"""
+프로세스 풀 크롤 모드 (Selenium 을 별도 프로세스에서)
+
+- 워커 프로세스 K개 (crawler.selenium_worker --serve), 각자 Chrome 1개
+- URL 은 stdin 으로 한 줄씩, 결과는 stdout JSON 한 줄씩
+- HARD_TIMEOUT 안에 응답 없으면 프로세스 그룹째(Chrome 포함) kill → 다음 요청 때 재시작
+- K 기본값 = CPU 코어 수와 가용 메모리 중 작은 쪽 기준
+→ Chrome 크래시 / 행이 메인 프로세스에 영향 ❌
+"""
+import atexit
+import json
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROCESS_WORKERS = int(os.environ.get("CRAWL_PROCESS_WORKERS", 0))     # 0 = 자동
+HARD_TIMEOUT = float(os.environ.get("CRAWL_PROCESS_TIMEOUT", 90))     # URL 1개 최대 시간 (초)
+START_TIMEOUT = float(os.environ.get("CRAWL_PROCESS_START_TIMEOUT", 60))
+MEM_PER_WORKER_MB = int(os.environ.get("CRAWL_PROCESS_MEM_MB", 600))  # 워커 + Chrome 1개 예상치
+
+
+class CrawlWorkerError(RuntimeError):
+    pass
+
+
+def _available_memory_mb():
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return None
+
+
+def default_workers() -> int:
+    cpus = os.cpu_count() or 1
+    limit = max(1, cpus - 1)   # 메인 프로세스 몫 1코어
+
+    mem = _available_memory_mb()
+    if mem is not None:
+        limit = min(limit, mem // MEM_PER_WORKER_MB)
+
+    return max(1, limit)
+
+
+# =========================
+# 워커 프로세스 1개
+# =========================
+class WorkerProcess:
+    def __init__(self):
+        self._proc = None
+        self._out = queue.Queue()
+
+    def start(self):
+        env = dict(os.environ, DRIVER_POOL_SIZE="1", PYTHONUNBUFFERED="1")
+        self._proc = subprocess.Popen(
+            [sys.executable, "-m", "crawler.selenium_worker", "--serve"],
+            cwd=PROJECT_ROOT,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+            # 새 프로세스 그룹 → kill 시 chromedriver / Chrome 까지 정리
+            start_new_session=os.name == "posix",
+        )
+        threading.Thread(target=self._read, daemon=True).start()
+
+        try:
+            self._receive(START_TIMEOUT)
+        except CrawlWorkerError:
+            self.kill()
+            raise
+        return self
+
+    def _read(self):
+        for line in self._proc.stdout:
+            try:
+                self._out.put(json.loads(line))
+            except ValueError:
+                print("⚠️ 워커 출력 무시:", line.rstrip())
+        self._out.put(None)   # EOF → 프로세스 종료
+
+    def _receive(self, timeout):
+        try:
+            msg = self._out.get(timeout=timeout)
+        except queue.Empty:
+            raise CrawlWorkerError(f"워커 응답 없음 ({timeout:.0f}s)")
+        if msg is None:
+            raise CrawlWorkerError(f"워커 종료됨 (exit={self._proc.poll()})")
+        return msg
+
+    def crawl(self, url, timeout=HARD_TIMEOUT):
+        try:
+            self._proc.stdin.write(url + "\n")
+            self._proc.stdin.flush()
+        except OSError as e:
+            raise CrawlWorkerError(f"워커 입력 실패: {e}")
+
+        return self._receive(timeout)
+
+    @property
+    def pid(self):
+        return self._proc.pid if self._proc else None
+
+    def kill(self):
+        if self._proc is None or self._proc.poll() is not None:
+            return
+        try:
+            if os.name == "posix":
+                os.killpg(self._proc.pid, signal.SIGKILL)
+            else:
+                self._proc.kill()
+        except OSError:
+            pass
+        self._proc.wait()
+
+    def close(self):
+        if self._proc is None or self._proc.poll() is not None:
+            return
+        try:
+            self._proc.stdin.close()
+            self._proc.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+
+# =========================
+# 🏭 워커 풀
+# =========================
+class CrawlProcessPool:
+    """
+    pool.crawl(url)  → (title, total, external, view, is_deleted)  (여러 스레드에서 동시 호출 가능)
+    pool.map(urls)   → (url, result, error) 를 끝나는 순서대로
+    """
+
+    def __init__(self, size=None, timeout=HARD_TIMEOUT):
+        self.size = max(1, size or PROCESS_WORKERS or default_workers())
+        self.timeout = timeout
+
+        self._idle = []
+        self._created = 0
+        self._cond = threading.Condition()
+
+        # 📊
+        self.completed = 0
+        self.restarts = 0
+
+    def _acquire(self):
+        with self._cond:
+            self._cond.wait_for(lambda: self._idle or self._created < self.size)
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+
+        try:
+            worker = WorkerProcess().start()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+        print("🚀 크롤 워커 시작: pid", worker.pid)
+        return worker
+
+    def _release(self, worker, broken=False):
+        if broken:
+            worker.kill()
+            with self._cond:
+                self._created -= 1
+                self.restarts += 1
+                self._cond.notify()
+            return
+
+        with self._cond:
+            self._idle.append(worker)
+            self._cond.notify()
+
+    def crawl(self, url):
+        worker = self._acquire()
+        broken = False
+        try:
+            msg = worker.crawl(url, timeout=self.timeout)
+        except CrawlWorkerError as e:
+            print("♻️ 크롤 워커 재시작:", worker.pid, e)
+            broken = True
+            raise
+        finally:
+            self._release(worker, broken=broken)
+
+        if not msg.get("ok"):
+            raise CrawlWorkerError(msg.get("error") or "크롤 실패")
+
+        with self._cond:
+            self.completed += 1
+        return msg["title"], msg["total"], msg["external"], msg["view"], msg["is_deleted"]
+
+    def map(self, urls):
+        with ThreadPoolExecutor(max_workers=self.size) as ex:
+            futures = {ex.submit(self.crawl, url): url for url in urls}
+            for f in as_completed(futures):
+                try:
+                    yield futures[f], f.result(), None
+                except Exception as e:
+                    yield futures[f], None, e
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+        for worker in idle:
+            worker.close()
+
+    def metrics(self) -> dict:
+        with self._cond:
+            return {
+                "size": self.size,
+                "running": self._created,
+                "completed": self.completed,
+                "restarts": self.restarts,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool(size=None) -> CrawlProcessPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = CrawlProcessPool(size=size)
+            atexit.register(_pool.close)
+        return _pool
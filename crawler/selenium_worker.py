@@ -1,19 +1,60 @@
-# import sys
-# import json
+"""
+Selenium 크롤 워커 프로세스 (crawler.process_pool 이 실행)
 
-# from crawler.naver_cafe_pc_selenium import get_comment_and_view_pc
+    python -m crawler.selenium_worker URL       → 결과 JSON 1줄 출력 후 종료
+    python -m crawler.selenium_worker --serve   → stdin 으로 URL 을 한 줄씩 받아 JSON 한 줄씩 응답
 
-# def main():
-#     url = sys.argv[1]
+- 프로세스당 Chrome 1개 (DRIVER_POOL_SIZE=1)
+- 크롤러 로그(print)는 stderr 로 → stdout 은 JSON 전용
+"""
+import json
+import os
+import sys
 
-#     title, comment, view, is_deleted = get_comment_and_view_pc(url)
+os.environ.setdefault("DRIVER_POOL_SIZE", "1")
 
-#     print(json.dumps({
-#         "title": title,a
-#         "comment": comment,
-#         "view": view,
-#         "is_deleted": is_deleted,
-#     }, ensure_ascii=False), flush=True)
+from crawler.driver import driver_pool
+from crawler.naver_cafe_pc_selenium import get_comment_and_view_pc
 
-# if __name__ == "__main__":
-#     main()
\ No newline at end of file
+
+def crawl(url: str) -> dict:
+    try:
+        title, total, external, view, is_deleted = get_comment_and_view_pc(url)
+    except Exception as e:
+        return {"url": url, "ok": False, "error": str(e)}
+
+    return {
+        "url": url,
+        "ok": True,
+        "title": title,
+        "total": total,
+        "external": external,
+        "view": view,
+        "is_deleted": is_deleted,
+    }
+
+
+def main():
+    out = sys.stdout
+    sys.stdout = sys.stderr
+
+    def emit(obj):
+        out.write(json.dumps(obj, ensure_ascii=False) + "\n")
+        out.flush()
+
+    if sys.argv[1:] != ["--serve"]:
+        emit(crawl(sys.argv[1]))
+        return
+
+    # Chrome 먼저 띄우고 준비 완료 알림 → 첫 URL 콜드스타트 ❌
+    driver_pool.warm_up()
+    emit({"ready": True, "pid": os.getpid()})
+
+    for line in sys.stdin:
+        url = line.strip()
+        if url:
+            emit(crawl(url))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from crawler.naver_cafe import get_comment_and_view_api
+from crawler.naver_cafe_pc_selenium import RenderError, get_comment_and_view_pc
+from crawler.process_pool import CrawlWorkerError
+from crawler.url_classifier import CRAWLER_NAVER_CAFE, classify_url
+from utils.cafe_guard import (
+    STATE_OK,
+    STATE_BLOCKED,
+    STATE_DELETED,
+    STATE_UNAVAILABLE,
+    check_cafe_post,
+)
+
+# 프로세스 풀 모드 (use_process_pool) → Selenium 을 워커 프로세스에서 실행
+_process_pool = None
+
+
+def use_process_pool(size=None):
+    global _process_pool
+    from crawler.process_pool import get_process_pool
+
+    _process_pool = get_process_pool(size)
+    return _process_pool
+
+
+def process_pool():
+    return _process_pool
+
+
+def _render(url: str):
+    if _process_pool is not None:
+        return _process_pool.crawl(url)
+    return get_comment_and_view_pc(url)
+
+
+def crawl_article(url: str):
+    """
+    접근성 확인 + 크롤링을 한 번에 (라우팅은 crawler.url_classifier)
+    1️⃣ HTTP JSON API (수십 ms) → 응답 자체가 ok / deleted 판정
+    2️⃣ API 가 답을 못 할 때만 HTML 1회 확인 → 차단/삭제면 종료
+    3️⃣ 접근 가능하면 Selenium 렌더링 (수 초, 프로세스 풀 모드면 워커 프로세스에서)
+       → 렌더링 실패(timeout / 워커 오류)는 unavailable (두 모드 동일)
+
+    return: (state, (title, total, external, view, is_deleted) | None)
+        state: ok / blocked / deleted / unavailable (일시적 실패)
+    """
+    route = classify_url(url)
+    if route.is_blocked or route.crawler != CRAWLER_NAVER_CAFE:
+        # 차단 사이트 / 지원하지 않는 사이트 → 네트워크 호출 없이 불가
+        return STATE_BLOCKED, None
+
+    result = get_comment_and_view_api(url)
+
+    if result is None:
+        state = check_cafe_post(url)
+        if state != STATE_OK:
+            return state, None
+        try:
+            result = _render(url)
+        except (RenderError, CrawlWorkerError) as e:
+            print("⚠️ 렌더링 실패 → 다음 실행에서 재시도:", e)
+            return STATE_UNAVAILABLE, None
+
+    return (STATE_DELETED if result[4] else STATE_OK), result
@@ -0,0 +1,155 @@
+"""
+URL 분류기 (크롤러 라우팅의 단일 진입점)
+
+URL 을 한 번만 파싱해서
+- 차단 사이트 여부 (host 접미사 → dict 조회, 부분 문자열 검색 ❌)
+- 어떤 크롤러로 보낼지
+- 중복 제거용 canonical key (네이버 카페 → (clubid | 별칭, articleid))
+를 한 번에 결정한다. 같은 URL 은 캐시된 결과 재사용.
+"""
+import re
+from functools import lru_cache
+from urllib.parse import parse_qs, urlparse
+
+# =========================
+# 차단 사이트 (host 접미사 → 사유)
+# =========================
+BLOCKED_HOSTS = {
+    "gnun.link": "단축 URL (리다이렉트 차단)",
+    "daedamo.com": "대다모 (봇 차단)",
+    "corp.babitalk.com": "바비톡 (사내 전용 URL)",
+    "gangnamunni.com": "강남언니 (JS/봇 차단)",
+    "sungyesa.com": "성예사 (로그인/봇 차단)",
+}
+
+# =========================
+# 크롤러
+# =========================
+CRAWLER_NAVER_CAFE = "naver_cafe"   # API → (HTML 확인) → Selenium
+
+NAVER_CAFE_HOST = "cafe.naver.com"
+
+_CLUB_ARTICLE_RE = re.compile(r"cafes/(\d+)/articles/(\d+)")
+_ALIAS_RE = re.compile(r"^[A-Za-z0-9_\-]+$")
+_NOT_ALIAS = {"ca-fe", "ArticleRead.nhn", "ArticleList.nhn"}
+_IFRAME_PARAMS = ("iframe_url_utf8", "iframe_url")
+
+
+class Route:
+    """
+    classify_url() 결과
+    - blocked_reason: 크롤링 불가 사유 (None 이면 크롤 가능)
+    - crawler: 담당 크롤러 (None → 크롤 대상 아님)
+    - key: canonical key (같은 글 = 같은 key)
+    - cafe / article_id / use_cafe_id: 네이버 카페 글일 때만
+    """
+
+    __slots__ = ("url", "host", "blocked_reason", "crawler", "key", "cafe", "article_id", "use_cafe_id")
+
+    def __init__(self, url, host, blocked_reason=None, crawler=None, key=None,
+                 cafe=None, article_id=None, use_cafe_id=False):
+        self.url = url
+        self.host = host
+        self.blocked_reason = blocked_reason
+        self.crawler = crawler
+        self.key = key
+        self.cafe = cafe
+        self.article_id = article_id
+        self.use_cafe_id = use_cafe_id
+
+    @property
+    def is_blocked(self) -> bool:
+        return self.blocked_reason is not None
+
+    def __repr__(self):
+        return f"Route(key={self.key!r}, crawler={self.crawler!r}, blocked={self.blocked_reason!r})"
+
+
+def _normalize_host(host: str) -> str:
+    host = (host or "").lower().rstrip(".")
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    return host
+
+
+def blocked_reason_for_host(host: str) -> str | None:
+    """
+    host 와 상위 도메인을 차례로 조회 (a.b.com → a.b.com, b.com, com)
+    """
+    labels = host.split(".")
+    for i in range(len(labels)):
+        reason = BLOCKED_HOSTS.get(".".join(labels[i:]))
+        if reason:
+            return reason
+    return None
+
+
+def _parse_cafe(parsed, depth=0):
+    """
+    네이버 카페 URL → (cafe, article_id, use_cafe_id) / 해석 불가 시 None
+    """
+    m = _CLUB_ARTICLE_RE.search(parsed.path)
+    if m:
+        return m.group(1), m.group(2), True
+
+    qs = parse_qs(parsed.query)
+    clubid = (qs.get("clubid") or [None])[0]
+    articleid = (qs.get("articleid") or [None])[0]
+    if clubid and articleid and clubid.isdigit() and articleid.isdigit():
+        return clubid, articleid, True
+
+    # cafe.naver.com/<alias>?iframe_url=/ArticleRead.nhn?clubid=..&articleid=..
+    if depth == 0:
+        for name in _IFRAME_PARAMS:
+            inner = (qs.get(name) or [None])[0]
+            if inner:
+                found = _parse_cafe(urlparse(inner), depth + 1)
+                if found:
+                    return found
+
+    parts = [p for p in parsed.path.split("/") if p]
+    if (
+        len(parts) >= 2
+        and parts[0] not in _NOT_ALIAS
+        and _ALIAS_RE.match(parts[0])
+        and parts[1].isdigit()
+    ):
+        return parts[0], parts[1], False
+
+    return None
+
+
+def _generic_key(host, parsed) -> str:
+    path = parsed.path.rstrip("/") or "/"
+    query = f"?{parsed.query}" if parsed.query else ""
+    return f"{host}{path}{query}"
+
+
+@lru_cache(maxsize=4096)
+def classify_url(url: str) -> Route:
+    parsed = urlparse((url or "").strip())
+    host = _normalize_host(parsed.hostname or "")
+
+    reason = blocked_reason_for_host(host) if host else None
+    if reason:
+        return Route(url, host, blocked_reason=reason, key=_generic_key(host, parsed))
+
+    if host == NAVER_CAFE_HOST:
+        cafe = _parse_cafe(parsed)
+        if cafe:
+            cafe_id, article_id, use_cafe_id = cafe
+            return Route(
+                url,
+                host,
+                crawler=CRAWLER_NAVER_CAFE,
+                # 별칭은 대소문자 구분 ❌
+                key=f"cafe:{cafe_id.lower()}:{article_id}",
+                cafe=cafe_id,
+                article_id=article_id,
+                use_cafe_id=use_cafe_id,
+            )
+        # 글 번호를 못 찾은 카페 URL → 기존처럼 HTML 확인 후 Selenium
+        return Route(url, host, crawler=CRAWLER_NAVER_CAFE, key=_generic_key(host, parsed))
+
+    return Route(url, host, key=_generic_key(host, parsed) if host else url)
@@ -0,0 +1,78 @@
+"""
+Selenium 조건 대기 (고정 sleep 대체) + 대기 시간 기록
+
+- timed_wait(): 조건이 참이 되는 즉시 반환, timeout 이면 None (예외 ❌)
+- 이름별 대기 횟수 / 평균 / 최대 / timeout 횟수 → wait_metrics()
+"""
+import os
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+COMMENT_WAIT_TIMEOUT = float(os.environ.get("SELENIUM_COMMENT_WAIT", 1.0))
+URL_WAIT_TIMEOUT = float(os.environ.get("SELENIUM_URL_WAIT", 2.0))
+POLL_INTERVAL = float(os.environ.get("SELENIUM_WAIT_POLL", 0.1))
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _record(name, elapsed, timed_out):
+    with _stats_lock:
+        s = _stats.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0, "timeouts": 0})
+        s["count"] += 1
+        s["total"] += elapsed
+        s["max"] = max(s["max"], elapsed)
+        s["timeouts"] += int(timed_out)
+
+
+def timed_wait(driver, condition, timeout, name):
+    """
+    condition(driver) 가 truthy 가 될 때까지 대기 → 그 값 (timeout 이면 None)
+    """
+    started = time.monotonic()
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(condition)
+        timed_out = False
+    except TimeoutException:
+        result = None
+        timed_out = True
+
+    _record(name, time.monotonic() - started, timed_out)
+    return result
+
+
+def wait_metrics() -> dict:
+    with _stats_lock:
+        return {
+            name: {
+                "count": s["count"],
+                "avg_sec": round(s["total"] / s["count"], 3) if s["count"] else 0.0,
+                "max_sec": round(s["max"], 3),
+                "timeouts": s["timeouts"],
+            }
+            for name, s in _stats.items()
+        }
+
+
+# =========================
+# 조건
+# =========================
+def any_element_present(selectors, until_ready=False):
+    """
+    CSS 셀렉터 중 하나라도 요소가 있으면 → (selector, elements)
+    until_ready=True → 문서 로드가 끝났는데도 없으면 더 기다리지 않음 → (None, [])
+    """
+    def _check(driver):
+        for sel in selectors:
+            els = driver.find_elements(By.CSS_SELECTOR, sel)
+            if els:
+                return sel, els
+        if until_ready and driver.execute_script("return document.readyState") == "complete":
+            return None, []
+        return False
+
+    return _check
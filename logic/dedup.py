@@ -0,0 +1,67 @@
+"""
+실행 단위 글 중복 제거 (여러 DB / 페이지가 같은 글을 가리킬 때 크롤 1회)
+
+- key = crawler.url_classifier 의 canonical key
+- 이미 크롤한 글 → 결과 재사용
+- 같은 글을 동시에 요청하면 먼저 온 쪽만 크롤, 나머지는 기다렸다가 결과 공유 (single-flight)
+  → 크롤하던 쪽이 실패하면 기다리던 쪽 중 하나만 이어서 크롤
+→ 페이지는 조회되는 대로 흘려보내는 스트리밍 구조 그대로 (전체 선수집 ❌)
+"""
+import threading
+
+from crawler.tiered import crawl_article
+from crawler.url_classifier import classify_url
+
+
+class CrawlMemo:
+    def __init__(self, crawl=crawl_article):
+        self._crawl = crawl
+        self._results = {}     # key → (state, result)
+        self._in_flight = {}   # key → threading.Event
+        self._lock = threading.Lock()
+
+        # 📊
+        self.crawled = 0
+        self.shared = 0
+
+    def crawl(self, url):
+        """
+        return: (state, result, fresh)
+            fresh: 이번 호출에서 실제로 크롤했으면 True (결과 공유면 False)
+        """
+        key = classify_url(url).key
+
+        while True:
+            with self._lock:
+                if key in self._results:
+                    self.shared += 1
+                    return (*self._results[key], False)
+
+                event = self._in_flight.get(key)
+                if event is None:
+                    # 크롤하는 쪽이 없음 → 이 호출이 크롤 (먼저 하던 쪽이 실패했으면 이어받음)
+                    event = self._in_flight[key] = threading.Event()
+                    break
+
+            event.wait()
+
+        try:
+            state, result = self._crawl(url)
+            with self._lock:
+                self._results[key] = (state, result)
+                self.crawled += 1
+            return state, result, True
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            event.set()
+
+    def reset(self):
+        with self._lock:
+            self._results.clear()
+
+    def report(self):
+        print(f"🔗 글 중복 제거: 크롤 {self.crawled}건, 결과 공유 {self.shared}건")
+
+
+crawl_memo = CrawlMemo()
@@ -0,0 +1,133 @@
+"""
+크롤 결과 이력 (append-only, 로컬 SQLite)
+
+- 크롤할 때마다 (url, 시각, total, external, view, 삭제 여부, 소요 시간) 1행 추가
+- latest_per_url(): url 별 마지막 결과
+- delta_since(T): url 별 T 시점 대비 증가량
+"""
+from datetime import datetime, timezone
+
+from utils.local_db import get_connection, ensure_schema
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    page_id TEXT,
+    ts TEXT NOT NULL,
+    state TEXT,
+    total INTEGER,
+    external INTEGER,
+    view INTEGER,
+    is_deleted INTEGER NOT NULL DEFAULT 0,
+    latency REAL
+);
+CREATE INDEX IF NOT EXISTS idx_crawl_history_url_ts ON crawl_history (url, ts);
+CREATE INDEX IF NOT EXISTS idx_crawl_history_ts ON crawl_history (ts);
+"""
+
+_COLUMNS = ("url", "page_id", "ts", "state", "total", "external", "view", "is_deleted", "latency")
+
+
+def _schema():
+    ensure_schema("crawl_history", _SCHEMA)
+    return get_connection()
+
+
+def _ts(dt=None) -> str:
+    # 항상 UTC ISO 문자열 → 사전순 = 시간순
+    if isinstance(dt, str):
+        dt = datetime.fromisoformat(dt.replace("Z", "+00:00"))
+    return (dt or datetime.now(timezone.utc)).astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def record_crawl(url, *, total=None, external=None, view=None, is_deleted=False,
+                 latency=None, state=None, page_id=None, ts=None):
+    conn = _schema()
+    with conn:
+        conn.execute(
+            f"INSERT INTO crawl_history ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+            (url, page_id, _ts(ts), state, total, external, view, int(bool(is_deleted)), latency),
+        )
+
+
+def _rows_to_dict(rows):
+    return {r["url"]: dict(r) for r in rows}
+
+
+def latest(url):
+    row = _schema().execute(
+        "SELECT * FROM crawl_history WHERE url = ? ORDER BY ts DESC LIMIT 1",
+        (url,),
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def latest_per_url(since=None):
+    """
+    url → 마지막 크롤 결과 (since 지정 시 그 이후에 크롤된 url 만)
+    """
+    where, params = ("WHERE ts >= ?", (_ts(since),)) if since else ("", ())
+    rows = _schema().execute(
+        f"""
+        SELECT h.* FROM crawl_history h
+        JOIN (
+            SELECT url, MAX(ts) AS ts FROM crawl_history {where} GROUP BY url
+        ) m ON m.url = h.url AND m.ts = h.ts
+        """,
+        params,
+    )
+    return _rows_to_dict(rows)
+
+
+def delta_since(since, urls=None):
+    """
+    url → {"total", "external", "view"} 증가량 (T 이후 마지막 값 - T 시점 값)
+    - T 이전 기록이 없으면 T 이후 첫 기록이 기준
+    - T 이후 크롤되지 않은 url 은 제외
+    """
+    since = _ts(since)
+    conn = _schema()
+
+    current = latest_per_url(since)
+    if urls is not None:
+        wanted = set(urls)
+        current = {u: r for u, r in current.items() if u in wanted}
+    if not current:
+        return {}
+
+    # 기준값: T 이전 마지막 기록
+    base = _rows_to_dict(conn.execute(
+        """
+        SELECT h.* FROM crawl_history h
+        JOIN (
+            SELECT url, MAX(ts) AS ts FROM crawl_history WHERE ts < ? GROUP BY url
+        ) m ON m.url = h.url AND m.ts = h.ts
+        """,
+        (since,),
+    ))
+    # 없으면 T 이후 첫 기록
+    missing = [u for u in current if u not in base]
+    if missing:
+        base.update(_rows_to_dict(conn.execute(
+            """
+            SELECT h.* FROM crawl_history h
+            JOIN (
+                SELECT url, MIN(ts) AS ts FROM crawl_history WHERE ts >= ? GROUP BY url
+            ) m ON m.url = h.url AND m.ts = h.ts
+            """,
+            (since,),
+        )))
+
+    def diff(now, before):
+        if now is None or before is None:
+            return None
+        return now - before
+
+    return {
+        url: {
+            key: diff(row[key], base[url][key])
+            for key in ("total", "external", "view")
+        }
+        for url, row in current.items()
+    }
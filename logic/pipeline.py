@@ -0,0 +1,177 @@
+"""
+스테이지 파이프라인 모드
+
+    DB 조회 → 필터 → 크롤링 → 노션 기록 (write-behind 큐)
+
+각 스테이지는 자기 워커 수만큼 스레드를 갖고, 스테이지 사이는
+크기가 제한된 Queue 로 연결된다.
+→ 전체 소요 시간 = 가장 느린 자원 기준 (지연 시간의 합 ❌)
+"""
+import os
+import queue
+import threading
+import traceback
+
+from config.notion_mapping import NOTION_DBS
+from notion.incremental import save_cursors
+from notion.write_queue import WriteBehindQueue
+from logic.process import prepare_page, crawl_page, fetch_target_pages
+from crawler.driver import POOL_SIZE, driver_pool
+from crawler.tiered import process_pool
+
+# =========================
+# 스테이지별 동시성 (환경변수로 조정)
+# =========================
+QUERY_WORKERS = int(os.environ.get("PIPELINE_QUERY_WORKERS", 4))
+FILTER_WORKERS = int(os.environ.get("PIPELINE_FILTER_WORKERS", 1))
+# 크롤 워커 1개 = 드라이버 1개 → 기본값은 드라이버 풀 크기
+CRAWL_WORKERS = int(os.environ.get("PIPELINE_CRAWL_WORKERS", POOL_SIZE))
+WRITE_WORKERS = int(os.environ.get("PIPELINE_WRITE_WORKERS", 3))
+
+QUEUE_SIZE = int(os.environ.get("PIPELINE_QUEUE_SIZE", 50))
+
+_STOP = object()
+
+
+def _start_workers(name, count, inbox, handle):
+    """
+    inbox 에서 작업을 꺼내 handle(item) 실행
+    ❗ 개별 작업 에러는 출력만 하고 절대 멈추지 않음
+    """
+    def _loop():
+        while True:
+            item = inbox.get()
+            try:
+                if item is _STOP:
+                    return
+                handle(item)
+            except Exception as e:
+                print(f"❌ [{name}] 작업 실패:", e)
+                traceback.print_exc()
+            finally:
+                inbox.task_done()
+
+    threads = [
+        threading.Thread(target=_loop, name=f"{name}-{i}", daemon=True)
+        for i in range(max(1, count))
+    ]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def _stop_workers(inbox, threads):
+    for _ in threads:
+        inbox.put(_STOP)
+    for t in threads:
+        t.join()
+
+
+def run_pipeline(dbs=None, incremental=False):
+    dbs = dbs if dbs is not None else NOTION_DBS
+
+    db_q = queue.Queue()
+    filter_q = queue.Queue(maxsize=QUEUE_SIZE)
+    crawl_q = queue.Queue(maxsize=QUEUE_SIZE)
+    # 같은 페이지 업데이트는 PATCH 1회로 합쳐서 기록
+    writer = WriteBehindQueue(workers=WRITE_WORKERS, max_pending=QUEUE_SIZE)
+
+    # 증분 커서 → 모든 크롤/기록 완료 후 저장 (기록 못 한 페이지는 hold)
+    cursors = {}
+    done_lock = threading.Lock()
+
+    def hold(page, cfg):
+        cursor = cursors.get(cfg["database_id"])
+        if cursor is not None:
+            cursor.hold(page.id)
+
+    # =========================
+    # 1️⃣ DB 조회
+    # =========================
+    def handle_db(item):
+        name, cfg = item
+        print(f"\n===== DB 조회 시작: {name} =====")
+
+        try:
+            pages, force, cursor = fetch_target_pages(
+                cfg, incremental=incremental
+            )
+        except Exception as e:
+            print("❌ DB 조회 실패:", name, e)
+            return   # 🔥 다음 DB로 넘어감
+
+        with done_lock:
+            cursors[cfg["database_id"]] = cursor
+
+        # 조회되는 대로 필터 스테이지로 흘려보냄
+        count = 0
+        for page in pages:
+            filter_q.put((page, cfg, force))
+            count += 1
+
+        print(f"[DB] {name} 페이지 수:", count)
+
+    # =========================
+    # 2️⃣ 필터
+    # =========================
+    def handle_filter(item):
+        page, cfg, force = item
+        action = prepare_page(page, cfg, force=force)
+        if action is None:
+            return
+
+        kind, value = action
+        if kind == "defer":
+            hold(page, cfg)
+        elif kind == "crawl":
+            crawl_q.put((page, cfg, value))
+        else:
+            writer.enqueue(page.id, value)
+
+    # =========================
+    # 3️⃣ 크롤링
+    # =========================
+    def handle_crawl(item):
+        page, cfg, url = item
+        print("URL 진입:", page.id)
+        updates = None
+        try:
+            updates = crawl_page(page, cfg, url)
+        finally:
+            # 일시적 실패 / 에러 → 다음 실행에서 다시 조회
+            if updates is None:
+                hold(page, cfg)
+        if updates:
+            writer.enqueue(page.id, updates)
+
+    crawl_workers = CRAWL_WORKERS
+    pool = process_pool()
+    if pool is not None:
+        # 프로세스 풀 모드: 크롤 워커 1개 = 워커 프로세스 1개
+        crawl_workers = pool.size
+    else:
+        if driver_pool.size < crawl_workers:
+            driver_pool.size = crawl_workers
+        try:
+            driver_pool.warm_up()
+        except Exception as e:
+            print("⚠️ 드라이버 예열 실패 (필요 시 생성):", e)
+
+    db_threads = _start_workers("query", QUERY_WORKERS, db_q, handle_db)
+    filter_threads = _start_workers("filter", FILTER_WORKERS, filter_q, handle_filter)
+    crawl_threads = _start_workers("crawl", crawl_workers, crawl_q, handle_crawl)
+
+    for name, cfg in dbs.items():
+        db_q.put((name, cfg))
+
+    # 상류 스테이지부터 순서대로 종료 → 하류 큐에 남은 작업은 모두 처리됨
+    _stop_workers(db_q, db_threads)
+    _stop_workers(filter_q, filter_threads)
+    _stop_workers(crawl_q, crawl_threads)
+
+    # 4️⃣ 노션 기록 (refresh flag 해제는 각 페이지 업데이트에 포함됨)
+    writer.close()
+    writer.report()
+
+    save_cursors(cursors.values(), writer.failed)
+    print("\n===== 파이프라인 종료 =====")
@@ -1,137 +1,404 @@
-from datetime import datetime, timezone, timedelta
+import itertools
 import time
+from datetime import datetime, timezone, timedelta
+
+import requests
 
-from crawler.naver_cafe_pc_selenium import get_comment_and_view_pc
-from utils.cafe_guard import is_cafe_post_accessible
-from notion.client import update_page
-from notion.fetch import (
-    get_url,
-    get_number,
-    get_select,
-    get_date,
+from crawler.url_classifier import classify_url
+from utils.cafe_guard import STATE_BLOCKED, STATE_DELETED, STATE_UNAVAILABLE
+from notion.client import iter_database, update_page, retrieve_page_cached
+from notion.fetch import PageRecord, POST_DATE_PROP, POST_TITLE_PROP, EXTERNAL_COUNT_PROP
+from notion.filters import (
+    and_,
+    or_,
+    status_equals,
+    checkbox_equals,
+    date_on_or_after,
+    date_is_empty,
 )
+from notion.incremental import query_changed_pages
+from notion import mirror
+from notion.diff import strip_unchanged
+from logic.schedule import crawl_schedule
+from logic.history import record_crawl
+from logic.dedup import crawl_memo
 
 # =========================
 # 설정
 # =========================
-BLOCKED_DOMAINS = [
-    "gnun.link",
-    "daedamo.com",
-    "corp.babitalk.com",
-    "gangnamunni.com",
-    "sungyesa.com",
-]
-
 CRAWL_MONTHS = 3
 CUTOFF_DATE = datetime.now(timezone.utc) - timedelta(days=30 * CRAWL_MONTHS)
 
+# 로컬 미러(notion.mirror) 사용 여부 → NOTION_MIRROR=0 이면 매번 서버 조회
+USE_MIRROR = mirror.MIRROR_ENABLED
+
 def get_block_reason(url: str) -> str | None:
     """
     크롤링 불가 사유 반환
     """
-    if "gnun.link" in url:
-        return "단축 URL (리다이렉트 차단)"
+    return classify_url(url).blocked_reason
+
+def is_blocked_url(url: str) -> bool:
+    return classify_url(url).is_blocked
 
-    if "daedamo.com" in url:
-        return "대다모 (봇 차단)"
 
-    if "corp.babitalk.com" in url:
-        return "바비톡 (사내 전용 URL)"
+# =========================
+# 0️⃣ DB 조회 (서버 측 필터)
+# =========================
+def _pending_filters(cfg):
+    """
+    '대기' + 날짜 컷오프 조건 → 좁은 것부터 시도
+    (DB에 날짜 속성이 없거나 타입이 다르면 다음 후보로)
+    """
+    status = status_equals(cfg["status"], "대기")
+    recent = or_(
+        date_on_or_after(POST_DATE_PROP, CUTOFF_DATE.date().isoformat()),
+        date_is_empty(POST_DATE_PROP),
+    )
+    return [and_(status, recent), status, None]
 
-    if "gangnamunni.com" in url:
-        return "강남언니 (JS/봇 차단)"
 
-    if "sungyesa.com" in url:
-        return "성예사 (로그인/봇 차단)"
+def _is_bad_filter(e) -> bool:
+    res = getattr(e, "response", None)
+    return res is not None and res.status_code == 400
 
-    return None
 
-def is_blocked_url(url: str) -> bool:
-    return any(domain in url for domain in BLOCKED_DOMAINS)
+def _iter_records(pages, cfg):
+    for p in pages:
+        yield PageRecord.from_page(p, cfg)
 
 
-def process_page(page, cfg, force=False):
-    print("URL 진입:", page["id"])
+def _primed(iterator):
+    """
+    첫 항목을 미리 받아둠 → 첫 요청 에러(필터 거부 등)가 여기서 바로 발생
+    """
+    iterator = iter(iterator)
+    try:
+        first = next(iterator)
+    except StopIteration:
+        return iter(())
+    return itertools.chain([first], iterator)
 
+
+def _has_flagged(cfg) -> bool:
+    """
+    refresh flag 체크된 페이지가 하나라도 있는지 (첫 응답 1건만 조회)
+    flag 해제는 각 페이지 업데이트에 포함됨 (_with_refresh_clear)
+    """
+    # 🔑 refresh flag 안전 처리
+    refresh_flag_prop = cfg.get("db_refresh_flag")
+    if not refresh_flag_prop:
+        return False
     try:
-        # 상태
-        status = get_select(page, cfg["status"])
-        if status != "대기" and not force:
-            return
-
-        # URL
-        url = get_url(page, cfg["url"])
-        if not url:
-            return
-
-        # 🚫 크롤링 불가 사이트
-        block_reason = get_block_reason(url)
-        if block_reason:
-            print(f"🚫 [BLOCKED] {block_reason} | URL={url}")
-
-            update_page(
-                page["id"],
-                {
-                    cfg["status"]: {"status": {"name": "불가"}},
-                    cfg["last_run"]: {
-                        "date": {"start": datetime.now(timezone.utc).isoformat()}
-                    },
-                    # 👉 선택사항: 노션에 사유 남기고 싶을 때
-                    # "불가 사유": {
-                    #     "rich_text": [{"text": {"content": block_reason}}]
-                    # }
-                }
-            )
-            return
-
-        if not is_cafe_post_accessible(url):
-            update_page(page["id"], {
-                cfg["status"]: {"status": {"name": "불가"}},
-                cfg["last_run"]: {"date": {"start": datetime.now(timezone.utc).isoformat()}}
-            })
-            return
-
-        # 날짜 필터
-        post_date = get_date(page, "날짜")
-        if post_date and post_date < CUTOFF_DATE:
-            print("⏭ 3개월 초과 → 스킵")
-            return
-
-        # 이전 값
-        prev_total = get_number(page, cfg["count"]) or 0
-        prev_external = get_number(page, "외부 댓글 수") or 0
-
-        # 크롤링
-        title, total, external, view, is_deleted = get_comment_and_view_pc(url)
-
-        if is_deleted:
-            update_page(page["id"], {
-                cfg["status"]: {"status": {"name": "삭제"}},
-                cfg["last_run"]: {"date": {"start": datetime.now(timezone.utc).isoformat()}}
-            })
-            return
-
-        print(f"[DEBUG] total {prev_total}→{total}, external {prev_external}→{external}")
-
-        updates = {
-            cfg["count"]: {"number": total},
-            "외부 댓글 수": {"number": external},
-            cfg["view"]: {"number": view},
-            cfg["last_run"]: {
-                "date": {"start": datetime.now(timezone.utc).isoformat()}
-            },
-            cfg["status"]: {"status": {"name": "확인완료"}},
-            "글 제목": {
-                "rich_text": [{"text": {"content": title or ""}}]
-            },
+        pages = iter_database(
+            cfg["database_id"], filter=checkbox_equals(refresh_flag_prop, True), page_size=1
+        )
+        return next(pages, None) is not None
+    except Exception as e:
+        print("⚠️ refresh flag 체크 실패 → force=False", e)
+        return False
+
+
+def _with_due_pages(pages, database_id, load):
+    """
+    '대기' 페이지 다음에 다음 크롤 시각이 지난 페이지 (상태 무관, 중복 제외)
+    → 크롤 빈도는 글 활동량(logic.schedule)을 따름
+    """
+    seen = set()
+    for p in pages:
+        seen.add(p["id"])
+        yield p
+
+    for page_id in crawl_schedule.due_pages(database_id):
+        if page_id in seen:
+            continue
+        try:
+            page = load(page_id)
+        except Exception as e:
+            print("⚠️ 크롤 예정 페이지 조회 실패:", page_id, e)
+            continue
+        if page is None or page.get("archived") or page.get("in_trash"):
+            continue
+        yield page
+
+
+def _fetch_from_mirror(cfg, force):
+    """
+    미러 동기화로 받는 페이지부터 바로 흘려보냄 (동기화 완료 대기 ❌)
+    refresh flag 는 동기화 전에 서버 필터로 확인 → force 여부를 먼저 정함
+    """
+    database_id = cfg["database_id"]
+
+    if force:
+        pages = mirror.iter_pages(database_id)
+        return _iter_records(pages, cfg), True, None
+
+    pages = mirror.iter_pages(database_id, cfg["status"], "대기")
+    pages = _with_due_pages(pages, database_id, mirror.get_page)
+    return _iter_records(pages, cfg), False, None
+
+
+def fetch_target_pages(cfg, incremental=False):
+    """
+    크롤링 후보 페이지 조회
+    return: (pages, force, cursor)
+        pages  → PageRecord 이터레이터 (조회되는 대로 바로 처리 가능)
+                 '대기' 페이지 + 다음 크롤 시각이 지난 페이지 (logic.schedule)
+        force  → refresh flag 체크된 페이지가 있으면 전체 조회
+        cursor → 증분 모드일 때 IncrementalCursor (아니면 None)
+                 기록 못 한 페이지는 cursor.hold(), 쓰기 완료 후 save_cursors()
+
+    미러 사용 시 증분 동기화하면서 바로 흘려보내고, 나머지는 로컬에서 선별 (incremental 무시)
+    """
+    # 크롤링 대상 DB 아님 (업체 리스트 등)
+    if "status" not in cfg or "url" not in cfg:
+        return [], False, None
+
+    database_id = cfg["database_id"]
+    force = _has_flagged(cfg)
+
+    if USE_MIRROR:
+        return _fetch_from_mirror(cfg, force)
+
+    if force:
+        pages = iter_database(database_id, prefetch=True)
+        return _iter_records(pages, cfg), True, None
+
+    for flt in _pending_filters(cfg):
+        try:
+            if incremental:
+                pages, cursor = query_changed_pages(database_id, filter=flt)
+            else:
+                pages = _primed(iter_database(database_id, filter=flt, prefetch=True))
+                cursor = None
+            pages = _with_due_pages(pages, database_id, retrieve_page_cached)
+            return _iter_records(pages, cfg), False, cursor
+        except requests.exceptions.HTTPError as e:
+            if flt is None or not _is_bad_filter(e):
+                raise
+            print("⚠️ 서버 필터 거부 → 조건 완화 후 재조회:", e)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _with_refresh_clear(page, cfg, updates):
+    """
+    refresh flag 체크된 페이지 → 같은 PATCH 에 flag 해제 포함 (별도 패스 ❌)
+    """
+    refresh_flag_prop = cfg.get("db_refresh_flag")
+    if refresh_flag_prop and page.refresh_flag:
+        updates[refresh_flag_prop] = {"checkbox": False}
+    return updates
+
+
+def _changed_only(page, cfg, updates):
+    """
+    현재 값과 다른 필드만 남김 (last_run 만 바뀐 경우는 주기적으로만 기록)
+    """
+    changed = strip_unchanged(
+        page.property_values(cfg),
+        updates,
+        last_run_prop=cfg.get("last_run"),
+        last_run=page.last_run,
+    )
+    if len(changed) < len(updates):
+        print(f"⏭ 변경 없음 {len(updates) - len(changed)}개 필드 생략")
+    return changed
+
+
+# =========================
+# 1️⃣ 필터 단계
+# =========================
+def prepare_page(page, cfg, force=False):
+    """
+    크롤링 여부 판단 (네트워크 호출 없음)
+    page: PageRecord
+    return:
+        ("crawl", url)      → 크롤링 필요
+        ("write", updates)  → 크롤링 없이 바로 기록
+        ("defer", None)     → 지금은 크롤 ❌ (다음 크롤 시각 전 / 예산 초과) → 아무것도 기록 ❌
+        None                → 스킵
+    """
+    action = _prepare(page, cfg, force)
+
+    if action is None:
+        # 스킵되는 페이지라도 refresh flag 는 해제
+        updates = _with_refresh_clear(page, cfg, {})
+        return ("write", updates) if updates else None
+
+    kind, value = action
+    if kind == "write":
+        updates = _changed_only(page, cfg, _with_refresh_clear(page, cfg, value))
+        return (kind, updates) if updates else None
+    return action
+
+
+def _prepare(page, cfg, force):
+    # 상태 ('대기' 가 아니어도 다음 크롤 시각이 지났으면 크롤 후보)
+    if page.status != "대기" and not force and not crawl_schedule.is_due(page.id):
+        return None
+
+    # URL
+    url = page.url
+    if not url:
+        return None
+
+    # 🚫 크롤링 불가 사이트
+    block_reason = get_block_reason(url)
+    if block_reason:
+        print(f"🚫 [BLOCKED] {block_reason} | URL={url}")
+        return "write", {
+            cfg["status"]: {"status": {"name": "불가"}},
+            cfg["last_run"]: {"date": {"start": _now_iso()}},
+            # 👉 선택사항: 노션에 사유 남기고 싶을 때
+            # "불가 사유": {
+            #     "rich_text": [{"text": {"content": block_reason}}]
+            # }
         }
 
-        # ✅ NEW 알림 조건 (외부 댓글만)
-        if external > prev_external:
-            updates[cfg["new"]] = {"checkbox": True}
+    # 날짜 필터 (접근성 체크 전에 → 오래된 글은 네트워크 호출 없이 스킵)
+    post_date = page.post_date
+    if post_date and post_date < CUTOFF_DATE:
+        print("⏭ 3개월 초과 → 스킵")
+        return None
+
+    # 🗓 다음 크롤 시각 전 / 은퇴 / 실행 예산 초과 → 이번엔 보류 (refresh flag 도 유지)
+    # force 실행이어도 스케줄 적용 → 이 페이지의 refresh flag 가 체크된 경우만 무시
+    # 다시 '대기' 가 된 페이지 → 은퇴 해제
+    # 같은 글을 가리키는 페이지는 예산 1회만 차감 (크롤 결과는 logic.dedup 에서 공유)
+    if not crawl_schedule.claim(
+        page.id,
+        key=classify_url(url).key,
+        cutoff=CUTOFF_DATE,
+        force=bool(page.refresh_flag),
+        revive=page.status == "대기",
+    ):
+        return "defer", None
+
+    return "crawl", url
+
+
+# =========================
+# 2️⃣ 크롤 단계
+# =========================
+def crawl_page(page, cfg, url):
+    """
+    접근성 확인 + 크롤링 (요청 1회) → 노션에 기록할 updates 반환
+    (현재 값과 같은 필드는 제외 → 전부 같으면 빈 dict)
+    일시적 접근 실패 → None (크롤 안 한 것으로, 다음 실행에서 재시도)
+    """
+    updates = _crawl_updates(page, cfg, url)
+    if updates is None:
+        return None
+    return _changed_only(page, cfg, updates)
+
+
+def _record_history(page, url, state, result, latency):
+    # 이력 기록 실패는 크롤 결과 반영을 막지 않음
+    try:
+        if result is None:
+            record_crawl(url, page_id=page.id, state=state, latency=latency,
+                         is_deleted=state == STATE_DELETED)
+        else:
+            _, total, external, view, is_deleted = result
+            record_crawl(url, page_id=page.id, state=state, latency=latency,
+                         total=total, external=external, view=view, is_deleted=is_deleted)
+    except Exception as e:
+        print("⚠️ 크롤 이력 기록 실패:", e)
+
+
+def _crawl_updates(page, cfg, url):
+    # 이전 값
+    prev_total = page.count or 0
+    prev_external = page.external_count or 0
+
+    # 크롤링 (HTTP fast path → Selenium fallback)
+    # 같은 글을 가리키는 다른 페이지가 이미 크롤했으면 결과만 공유
+    started = time.monotonic()
+    state, result, fresh = crawl_memo.crawl(url)
+    if fresh:
+        _record_history(page, url, state, result, time.monotonic() - started)
+
+    if state == STATE_UNAVAILABLE:
+        # 요청 실패 / 429 / 5xx → 크롤 안 한 것으로 (상태·refresh flag·다음 크롤 시각 그대로)
+        print("⚠️ 일시적 접근 실패 → 다음 실행에서 재시도:", url)
+        return None
+
+    if state == STATE_BLOCKED:
+        crawl_schedule.retire(page.id, database_id=cfg["database_id"])
+        return _with_refresh_clear(page, cfg, {
+            cfg["status"]: {"status": {"name": "불가"}},
+            cfg["last_run"]: {"date": {"start": _now_iso()}},
+        })
+
+    if result is None or result[4]:
+        crawl_schedule.retire(page.id, database_id=cfg["database_id"])
+        return _with_refresh_clear(page, cfg, {
+            cfg["status"]: {"status": {"name": "삭제"}},
+            cfg["last_run"]: {"date": {"start": _now_iso()}},
+        })
+
+    title, total, external, view, _ = result
+    crawl_schedule.record(page.id, total, database_id=cfg["database_id"])
+
+    print(f"[DEBUG] total {prev_total}→{total}, external {prev_external}→{external}")
+
+    updates = {
+        cfg["count"]: {"number": total},
+        cfg.get("external_count", EXTERNAL_COUNT_PROP): {"number": external},
+        cfg["view"]: {"number": view},
+        cfg["last_run"]: {"date": {"start": _now_iso()}},
+        cfg["status"]: {"status": {"name": "확인완료"}},
+        POST_TITLE_PROP: {
+            "rich_text": [{"text": {"content": title or ""}}]
+        },
+    }
+
+    # ✅ NEW 알림 조건 (외부 댓글만)
+    if external > prev_external:
+        updates[cfg["new"]] = {"checkbox": True}
+
+    return _with_refresh_clear(page, cfg, updates)
+
+
+# =========================
+# 순차 처리 (필터 → 크롤 → 기록)
+# =========================
+def process_page(page, cfg, force=False, writer=None):
+    """
+    writer: WriteBehindQueue → 기록을 큐에 넘기고 바로 다음 페이지로
+            None             → update_page 로 즉시 기록
+    return: False → 이번 실행에서 처리 못 함 (보류 / 일시적 실패 / 에러) → 증분 커서 보류
+    """
+    if not isinstance(page, PageRecord):
+        page = PageRecord.from_page(page, cfg)
+
+    print("URL 진입:", page.id)
+
+    try:
+        action = prepare_page(page, cfg, force=force)
+        if action is None:
+            return True
+
+        kind, value = action
+        if kind == "defer":
+            return False
+        if kind == "crawl":
+            updates = crawl_page(page, cfg, value)
+            if updates is None:
+                return False
+        else:
+            updates = value
 
-        update_page(page["id"], updates)
-        time.sleep(0.6)
+        if not updates:
+            return True
+        if writer is not None:
+            writer.enqueue(page.id, updates)
+            return True
+        return update_page(page.id, updates)
 
     except Exception as e:
-        print("❌ ERROR PAGE:", page["id"], e)
\ No newline at end of file
+        print("❌ ERROR PAGE:", page.id, e)
+        return False
@@ -0,0 +1,265 @@
+"""
+적응형 크롤 스케줄 (글 단위 다음 크롤 시각)
+
+- 댓글 수가 늘었으면 → 최소 간격으로 (자주)
+- 변화 없으면 → 간격 x2 (최대 MAX_INTERVAL_HOURS)
+- 삭제 확인 / 차단 → 은퇴, 첫 크롤 후 CRAWL_MONTHS 지나도 은퇴
+  (일시적 실패는 크롤 안 한 것으로 취급 → next_due 그대로)
+- 다음 크롤 시각이 지난 페이지는 상태와 무관하게 크롤 후보 (due_pages)
+- 은퇴한 페이지가 다시 '대기' 가 되면 은퇴 해제
+- refresh flag 가 체크된 페이지만 다음 크롤 시각 / 은퇴 무시 (예산은 적용)
+- 실행당 크롤 예산 (CRAWL_BUDGET, 0 = 무제한) → 같은 글(canonical key)은 1회만 차감
+  → 예산 밖 페이지는 due 상태 그대로 남아 다음 실행에서 먼저 처리됨
+"""
+import os
+import threading
+from datetime import datetime, timezone, timedelta
+
+from utils.local_db import get_connection, ensure_schema, ensure_column
+
+SCHEDULE_ENABLED = os.environ.get("CRAWL_SCHEDULE", "1") == "1"
+MIN_INTERVAL_HOURS = float(os.environ.get("CRAWL_MIN_INTERVAL_HOURS", 3))
+MAX_INTERVAL_HOURS = float(os.environ.get("CRAWL_MAX_INTERVAL_HOURS", 24 * 7))
+BACKOFF = 2.0
+CRAWL_BUDGET = int(os.environ.get("CRAWL_BUDGET", 0))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_schedule (
+    page_id TEXT PRIMARY KEY,
+    first_crawl TEXT NOT NULL,
+    last_crawl TEXT NOT NULL,
+    next_due TEXT,              -- NULL = 은퇴
+    interval_hours REAL NOT NULL,
+    last_total INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_crawl_schedule_due ON crawl_schedule (next_due);
+"""
+
+
+def _schema():
+    ensure_schema("crawl_schedule", _SCHEMA)
+    # DB 별 due 페이지 조회용 (기존 파일에도 추가)
+    ensure_column("crawl_schedule", "database_id", "TEXT")
+    return get_connection()
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+class CrawlSchedule:
+    def __init__(self, budget=CRAWL_BUDGET, enabled=SCHEDULE_ENABLED):
+        self.budget = budget
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._charged = set()   # 이번 실행에서 예산을 쓴 canonical key
+        # 📊
+        self.claimed = 0
+        self.not_due = 0
+        self.retired = 0
+        self.over_budget = 0
+        self.revived = 0
+        self.shared = 0
+
+    # =========================
+    # 크롤 여부
+    # =========================
+    def claim(self, page_id, key=None, cutoff=None, now=None, force=False, revive=False) -> bool:
+        """
+        지금 크롤해야 하면 True (예산 1 소모)
+        key: 글 canonical key → 이미 예산을 쓴 글이면 차감 ❌ (크롤 결과 공유)
+        cutoff: 첫 크롤이 이보다 오래되면 은퇴 (작성일 없는 글 대비)
+        force: 이 페이지의 refresh flag 체크됨 → 다음 크롤 시각 / 은퇴 무시
+        revive: 다시 '대기' 가 된 페이지 → 은퇴 해제
+        """
+        if not self.enabled:
+            return True
+
+        now = now or _now()
+        row = _schema().execute(
+            "SELECT first_crawl, next_due FROM crawl_schedule WHERE page_id = ?",
+            (page_id,),
+        ).fetchone()
+
+        if row is not None:
+            retired = row["next_due"] is None
+            if retired and (force or revive):
+                self.revive(page_id, now)
+            elif force:
+                pass
+            elif retired or (
+                cutoff and datetime.fromisoformat(row["first_crawl"]) < cutoff
+            ):
+                with self._lock:
+                    self.retired += 1
+                return False
+            elif datetime.fromisoformat(row["next_due"]) > now:
+                with self._lock:
+                    self.not_due += 1
+                return False
+
+        with self._lock:
+            if key is not None and key in self._charged:
+                self.shared += 1
+                return True
+            if self.budget and self.claimed >= self.budget:
+                self.over_budget += 1
+                return False
+            self.claimed += 1
+            if key is not None:
+                self._charged.add(key)
+            return True
+
+    def is_due(self, page_id, now=None) -> bool:
+        """
+        다음 크롤 시각이 지났으면 True (기록 없음 / 은퇴 → False)
+        """
+        if not self.enabled:
+            return False
+
+        now = now or _now()
+        row = _schema().execute(
+            "SELECT next_due FROM crawl_schedule WHERE page_id = ?",
+            (page_id,),
+        ).fetchone()
+        return (
+            row is not None
+            and row["next_due"] is not None
+            and datetime.fromisoformat(row["next_due"]) <= now
+        )
+
+    def due_pages(self, database_id, now=None) -> list:
+        """
+        이 DB 에서 다음 크롤 시각이 지난 페이지 id (상태와 무관, 오래된 순)
+        """
+        if not self.enabled:
+            return []
+
+        now = now or _now()
+        rows = _schema().execute(
+            "SELECT page_id FROM crawl_schedule "
+            "WHERE database_id = ? AND next_due IS NOT NULL AND next_due <= ? "
+            "ORDER BY next_due",
+            (database_id, now.isoformat()),
+        )
+        return [r["page_id"] for r in rows]
+
+    # =========================
+    # 크롤 결과 반영
+    # =========================
+    def record(self, page_id, total, now=None, database_id=None):
+        """
+        댓글 수 증가 → 최소 간격 / 변화 없음 → 간격 x BACKOFF
+        """
+        if not self.enabled:
+            return
+
+        now = now or _now()
+        conn = _schema()
+        row = conn.execute(
+            "SELECT first_crawl, interval_hours, last_total FROM crawl_schedule WHERE page_id = ?",
+            (page_id,),
+        ).fetchone()
+
+        if row is None:
+            first_crawl = now.isoformat()
+            interval = MIN_INTERVAL_HOURS
+        else:
+            first_crawl = row["first_crawl"]
+            grew = (
+                total is not None
+                and row["last_total"] is not None
+                and total > row["last_total"]
+            )
+            interval = (
+                MIN_INTERVAL_HOURS if grew
+                else min(MAX_INTERVAL_HOURS, row["interval_hours"] * BACKOFF)
+            )
+
+        self._save(
+            conn, page_id, first_crawl, now, now + timedelta(hours=interval), interval, total,
+            database_id,
+        )
+
+    def retire(self, page_id, now=None, database_id=None):
+        """
+        삭제 확인 / 차단 → 더 이상 크롤 ❌ (다시 '대기' 가 되거나 refresh 하면 해제)
+        """
+        if not self.enabled:
+            return
+
+        now = now or _now()
+        conn = _schema()
+        row = conn.execute(
+            "SELECT first_crawl FROM crawl_schedule WHERE page_id = ?",
+            (page_id,),
+        ).fetchone()
+        first_crawl = row["first_crawl"] if row else now.isoformat()
+        self._save(conn, page_id, first_crawl, now, None, MAX_INTERVAL_HOURS, None, database_id)
+
+    def revive(self, page_id, now=None):
+        """
+        은퇴 해제 → 바로 크롤 대상 (간격은 최소부터 다시)
+        """
+        if not self.enabled:
+            return
+
+        now = now or _now()
+        conn = _schema()
+        with conn:
+            conn.execute(
+                "UPDATE crawl_schedule SET next_due = ?, interval_hours = ? "
+                "WHERE page_id = ? AND next_due IS NULL",
+                (now.isoformat(), MIN_INTERVAL_HOURS, page_id),
+            )
+        with self._lock:
+            self.revived += 1
+
+    def _save(self, conn, page_id, first_crawl, now, next_due, interval, total, database_id):
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO crawl_schedule
+                    (page_id, first_crawl, last_crawl, next_due, interval_hours, last_total,
+                     database_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(page_id) DO UPDATE SET
+                    last_crawl = excluded.last_crawl,
+                    next_due = excluded.next_due,
+                    interval_hours = excluded.interval_hours,
+                    last_total = COALESCE(excluded.last_total, last_total),
+                    database_id = COALESCE(excluded.database_id, database_id)
+                """,
+                (
+                    page_id,
+                    first_crawl,
+                    now.isoformat(),
+                    next_due.isoformat() if next_due else None,
+                    interval,
+                    total,
+                    database_id,
+                ),
+            )
+
+    def report(self):
+        if not self.enabled:
+            return
+        budget = self.budget or "∞"
+        print(
+            f"🗓 크롤 스케줄: 크롤 {self.claimed}/{budget} (같은 글 {self.shared}), "
+            f"대기(미도래) {self.not_due}, 은퇴 {self.retired} (해제 {self.revived}), "
+            f"예산 초과 {self.over_budget}"
+        )
+
+
+def reset_schedule(page_id=None):
+    conn = _schema()
+    with conn:
+        if page_id is None:
+            conn.execute("DELETE FROM crawl_schedule")
+        else:
+            conn.execute("DELETE FROM crawl_schedule WHERE page_id = ?", (page_id,))
+
+
+crawl_schedule = CrawlSchedule()
@@ -1,70 +1,95 @@
 from utils.run_lock import acquire_lock, release_lock
 
 from config.notion_mapping import NOTION_DBS
-from notion.client import query_database, update_page
-from notion.fetch import get_checkbox
-from logic.process import process_page
+from notion.incremental import save_cursors
+from notion.rate_limit import notion_limiter
+from notion.write_queue import WriteBehindQueue
+from logic.process import process_page, fetch_target_pages
+from logic.pipeline import run_pipeline
+from logic.schedule import crawl_schedule
+from logic.dedup import crawl_memo
+from crawler.tiered import use_process_pool
+from crawler.waits import wait_metrics
 
+import os
+import sys
 import traceback
 
-try:
-    acquire_lock()
+# 🔀 파이프라인 모드: python main.py --pipeline (또는 PIPELINE_MODE=1)
+PIPELINE_MODE = "--pipeline" in sys.argv or os.environ.get("PIPELINE_MODE") == "1"
+# ⏩ 증분 모드: 지난 실행 이후 수정된 페이지만 조회 (python main.py --incremental)
+INCREMENTAL_MODE = "--incremental" in sys.argv or os.environ.get("NOTION_INCREMENTAL") == "1"
+# 🏭 프로세스 풀 모드: Selenium 을 워커 프로세스 K개에서 (python main.py --pipeline --processes)
+PROCESS_MODE = "--processes" in sys.argv or os.environ.get("CRAWL_PROCESS_MODE") == "1"
+
+
+def run_sequential():
+    # 기록은 write-behind 큐로 → 크롤링과 노션 PATCH 가 겹쳐서 진행
+    writer = WriteBehindQueue()
+    cursors = []
+    try:
+        _run_sequential(writer, cursors)
+    finally:
+        writer.close()
+        writer.report()
+
+    # 증분 커서는 큐 flush 이후에 저장 (쓰기 실패 페이지는 다음 실행에서 다시 조회)
+    save_cursors(cursors, writer.failed)
 
+
+def _run_sequential(writer, cursors):
     for name, cfg in NOTION_DBS.items():
         print(f"\n===== DB 처리 시작: {name} =====")
 
         try:
-            pages = query_database(cfg["database_id"])
+            pages, force, cursor = fetch_target_pages(
+                cfg, incremental=INCREMENTAL_MODE
+            )
         except Exception as e:
             print("❌ DB 조회 실패:", e)
             continue   # 🔥 다음 DB로 넘어감
 
-        print(f"[DB] {name} 페이지 수:", len(pages))
-
-        # =========================
-        # 🔑 refresh flag 안전 처리
-        # =========================
-        refresh_flag_prop = cfg.get("db_refresh_flag")
-
-        if refresh_flag_prop:
-            try:
-                force = any(
-                    get_checkbox(p, refresh_flag_prop)
-                    for p in pages
-                )
-            except Exception as e:
-                print("⚠️ refresh flag 체크 실패 → force=False", e)
-                force = False
-        else:
-            force = False
-
-        for idx, page in enumerate(pages, start=1):
-            print(f"[{idx}/{len(pages)}] processing")
-            try:
-                process_page(page, cfg, force=force)
-            except Exception as e:
-                print("❌ process_page 에러:", page["id"], e)
-                traceback.print_exc()
-                continue   # 🔥 절대 멈추지 않음
-
-        # =========================
-        # refresh flag 해제 (있는 DB만)
-        # =========================
-        if force and refresh_flag_prop:
-            print("🔄 refresh flag 해제 중...")
-            for p in pages:
+        cursors.append(cursor)
+
+        # 조회되는 대로 바로 처리 (전체 페이지네이션 대기 ❌)
+        idx = 0
+        try:
+            for idx, page in enumerate(pages, start=1):
+                print(f"[{idx}] processing")
                 try:
-                    update_page(
-                        p["id"],
-                        {
-                            refresh_flag_prop: {"checkbox": False}
-                        }
-                    )
+                    done = process_page(page, cfg, force=force, writer=writer)
                 except Exception as e:
-                    print("⚠️ refresh flag 해제 실패:", p["id"], e)
-                    continue
+                    print("❌ process_page 에러:", page.id, e)
+                    traceback.print_exc()
+                    done = False   # 🔥 절대 멈추지 않음
+                if not done and cursor is not None:
+                    cursor.hold(page.id)   # 다음 실행에서 다시 조회
+        except Exception as e:
+            print("❌ DB 조회 중단:", e)
+
+        print(f"[DB] {name} 페이지 수:", idx)
 
         print(f"===== DB 처리 종료: {name} =====")
 
+
+try:
+    acquire_lock()
+
+    if PROCESS_MODE:
+        pool = use_process_pool()
+        print("🏭 프로세스 풀 모드: 워커", pool.size)
+
+    if PIPELINE_MODE:
+        run_pipeline(incremental=INCREMENTAL_MODE)
+    else:
+        run_sequential()
+
+    crawl_schedule.report()
+    crawl_memo.report()
+    if PROCESS_MODE:
+        print("🏭 크롤 워커:", use_process_pool().metrics())
+    print("⏱ Selenium 대기:", wait_metrics())
+    print("📊 Notion rate limiter:", notion_limiter.metrics())
+
 finally:
     release_lock()
\ No newline at end of file
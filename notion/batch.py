@@ -0,0 +1,28 @@
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_CONCURRENCY = 4
+
+
+def run_batch(fn, items, concurrency=DEFAULT_CONCURRENCY, label="batch"):
+    """
+    items 각각에 fn(item) 동시 실행 (속도 제한은 notion.rate_limit 이 담당)
+    ❗ 개별 실패는 기록만 하고 계속 진행
+    return: [(item, ok, result_or_error), ...]  (입력 순서 유지)
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def _one(item):
+        try:
+            return item, True, fn(item)
+        except Exception as e:
+            print(f"⚠️ [{label}] 실패:", item, e)
+            return item, False, e
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        results = list(pool.map(_one, items))
+
+    failed = sum(1 for _, ok, _ in results if not ok)
+    print(f"📦 [{label}] {len(results) - failed}/{len(results)} 성공")
+    return results
@@ -0,0 +1,110 @@
+"""
+Notion 읽기 캐시 (TTL + LRU, 프로세스 단위)
+
+- page_cache: page_id → retrieve_page 결과
+- children_cache: block/page id → 자식 블록 목록
+- 쓰기 후 invalidate(id) → 해당 페이지 / 블록의 캐시 제거 (삭제 시 부모의 자식 목록까지)
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_TTL = float(os.environ.get("NOTION_CACHE_TTL", 300))
+CACHE_SIZE = int(os.environ.get("NOTION_CACHE_SIZE", 512))
+
+_MISSING = object()
+
+
+class TTLCache:
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()   # key → (expires_at, value)
+        self._lock = threading.Lock()
+
+        # 📊
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            if entry is not _MISSING:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def get_or_load(self, key, load):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = load(key)
+            self.put(key, value)
+        return value
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+page_cache = TTLCache()
+children_cache = TTLCache()
+
+# 자식 block id → 부모 id (자식 삭제/수정 시 부모의 자식 목록도 무효화)
+_parent_of = {}
+_parent_lock = threading.Lock()
+
+
+def remember_children(parent_id, blocks):
+    children_cache.put(parent_id, blocks)
+    with _parent_lock:
+        for b in blocks:
+            _parent_of[b["id"]] = parent_id
+
+
+def invalidate(block_or_page_id, include_parent=False):
+    """
+    include_parent=True → 부모의 자식 목록도 제거 (블록 삭제 등)
+    자식 추가만 한 경우엔 부모 목록은 그대로 유효
+    """
+    page_cache.pop(block_or_page_id)
+    children_cache.pop(block_or_page_id)
+
+    if not include_parent:
+        return
+
+    with _parent_lock:
+        parent_id = _parent_of.pop(block_or_page_id, None)
+    if parent_id is not None:
+        children_cache.pop(parent_id)
+
+
+def clear():
+    page_cache.clear()
+    children_cache.clear()
+    with _parent_lock:
+        _parent_of.clear()
+
+
+def metrics() -> dict:
+    return {"pages": page_cache.metrics(), "children": children_cache.metrics()}
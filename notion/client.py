@@ -1,8 +1,14 @@
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 from dotenv import load_dotenv
 
+from notion import cache
+from notion.batch import DEFAULT_CONCURRENCY, run_batch
+from notion.rate_limit import RETRY_STATUS, notion_limiter, parse_retry_after
+
 load_dotenv()
 
 NOTION_TOKEN = os.environ.get("NOTION_TOKEN")
@@ -18,61 +24,132 @@ _session = requests.Session()
 _session.headers.update(HEADERS)
 
 DEFAULT_TIMEOUT = 10
-RATE_LIMIT_SLEEP = 0.25   # 🔥 Notion 안정용
+MAX_RATE_LIMIT_RETRY = 4
+
+
+def _request(method, url, **kwargs):
+    """
+    모든 Notion 호출의 단일 진입점
+    - 공용 token bucket 으로 속도 제한 (고정 sleep ❌)
+    - 429 / 502 / 503 → Retry-After 반영 후 재시도
+    """
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+
+    for attempt in range(1, MAX_RATE_LIMIT_RETRY + 1):
+        notion_limiter.acquire()
+        res = _session.request(method, url, **kwargs)
+
+        if res.status_code in RETRY_STATUS and attempt < MAX_RATE_LIMIT_RETRY:
+            retry_after = parse_retry_after(res.headers.get("Retry-After"))
+            notion_limiter.penalize(retry_after)
+            print(
+                f"⚠️ Notion {res.status_code} → 재시도 {attempt}/{MAX_RATE_LIMIT_RETRY} "
+                f"(rate={notion_limiter.rate:.2f}/s)"
+            )
+            continue
+
+        notion_limiter.reward()
+        return res
 
 
 # =========================
 # Database
 # =========================
-def query_database(database_id):
+def iter_database(database_id, filter=None, sorts=None, page_size=100, prefetch=False):
+    """
+    100개 단위 응답이 올 때마다 바로 yield (전체 페이지네이션 대기 ❌)
+    prefetch=True → 현재 배치를 처리하는 동안 다음 cursor 를 백그라운드 조회
+    filter / sorts: Notion query 문법 그대로 (notion.filters 참고)
+    """
     url = f"https://api.notion.com/v1/databases/{database_id}/query"
 
-    all_results = []
-    payload = {}
-
-    while True:
-        res = _session.post(url, json=payload, timeout=DEFAULT_TIMEOUT)
+    payload = {"page_size": page_size}
+    if filter:
+        payload["filter"] = filter
+    if sorts:
+        payload["sorts"] = sorts
+
+    def fetch(cursor):
+        body = dict(payload)
+        if cursor:
+            body["start_cursor"] = cursor
+        res = _request("POST", url, json=body)
         res.raise_for_status()
+        return res.json()
 
-        data = res.json()
-        all_results.extend(data.get("results", []))
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
 
-        if not data.get("has_more"):
-            break
+    try:
+        data = fetch(None)
+
+        while True:
+            pending = None
+            if data.get("has_more"):
+                cursor = data.get("next_cursor")
+                pending = executor.submit(fetch, cursor) if executor else cursor
+
+            yield from data.get("results", [])
+
+            if pending is None:
+                return
 
-        payload["start_cursor"] = data.get("next_cursor")
-        time.sleep(RATE_LIMIT_SLEEP)
+            data = pending.result() if executor else fetch(pending)
 
-    return all_results
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def query_database(database_id, filter=None, sorts=None):
+    """
+    전체 결과를 리스트로 (iter_database 참고)
+    """
+    return list(iter_database(database_id, filter=filter, sorts=sorts))
 
 
 def retrieve_page(page_id):
     url = f"https://api.notion.com/v1/pages/{page_id}"
-    res = _session.get(url, timeout=DEFAULT_TIMEOUT)
+    res = _request("GET", url)
     res.raise_for_status()
-    time.sleep(RATE_LIMIT_SLEEP)
     return res.json()
 
 
+def retrieve_page_cached(page_id):
+    """
+    retrieve_page + TTL 캐시 (같은 실행 안에서 같은 페이지 재조회 ❌)
+    """
+    return cache.page_cache.get_or_load(page_id, retrieve_page)
+
+
 # =========================
 # Page Update
 # =========================
-def update_page(page_id, properties, retry=2):
+def patch_page(page_id, properties):
+    """
+    PATCH 1회 (실패 시 예외 그대로 → 호출자가 재시도 정책 결정)
+    """
     url = f"https://api.notion.com/v1/pages/{page_id}"
-    payload = {"properties": properties}
+    try:
+        res = _request("PATCH", url, json={"properties": properties})
+        res.raise_for_status()
+    finally:
+        cache.invalidate(page_id)
 
+
+def update_page(page_id, properties, retry=2) -> bool:
+    """
+    실패해도 예외 ❌ → 성공 여부만 반환 (집계가 필요하면 patch_page)
+    """
     for attempt in range(1, retry + 1):
         try:
-            res = _session.patch(url, json=payload, timeout=DEFAULT_TIMEOUT)
-            res.raise_for_status()
-            time.sleep(RATE_LIMIT_SLEEP)
-            return
+            patch_page(page_id, properties)
+            return True
         except requests.exceptions.RequestException as e:
             print(f"⚠️ Notion update retry {attempt}/{retry}:", e)
             time.sleep(1.5 * attempt)
 
     print("❌ Notion update failed permanently:", page_id)
-    return
+    return False
 
 
 # =========================
@@ -98,9 +175,11 @@ def prepend_text_block(page_id: str, text: str):
         ]
     }
 
-    res = _session.patch(url, json=payload, timeout=DEFAULT_TIMEOUT)
-    res.raise_for_status()
-    time.sleep(RATE_LIMIT_SLEEP)
+    try:
+        res = _request("PATCH", url, json=payload)
+        res.raise_for_status()
+    finally:
+        cache.invalidate(page_id)
 
 
 def append_block_to_block(block_id: str, text: str):
@@ -123,82 +202,175 @@ def append_block_to_block(block_id: str, text: str):
         ]
     }
 
-    res = _session.patch(url, json=payload, timeout=DEFAULT_TIMEOUT)
-    res.raise_for_status()
-    time.sleep(RATE_LIMIT_SLEEP)
+    try:
+        res = _request("PATCH", url, json=payload)
+        res.raise_for_status()
+    finally:
+        cache.invalidate(block_id)
 
 
 def delete_block(block_id: str):
     url = f"https://api.notion.com/v1/blocks/{block_id}"
-    res = _session.delete(url, timeout=DEFAULT_TIMEOUT)
-    res.raise_for_status()
-    time.sleep(RATE_LIMIT_SLEEP)
+    try:
+        res = _request("DELETE", url)
+        res.raise_for_status()
+    finally:
+        cache.invalidate(block_id, include_parent=True)
+
+
+def _delete_block_idempotent(block_id: str):
+    # 이미 삭제된 블록(404) → 성공으로 처리
+    try:
+        delete_block(block_id)
+    except requests.exceptions.HTTPError as e:
+        if getattr(e.response, "status_code", None) != 404:
+            raise
+
+
+def bulk_delete_blocks(block_ids, concurrency=DEFAULT_CONCURRENCY):
+    """
+    여러 블록 동시 삭제 (속도는 공용 rate limiter 가 제한)
+    return: [(block_id, ok, None | error), ...]  (입력 순서 유지)
+    """
+    return [
+        (block_id, ok, None if ok else result)
+        for block_id, ok, result in run_batch(
+            _delete_block_idempotent, block_ids,
+            concurrency=concurrency, label="블록 삭제",
+        )
+    ]
+
+
+def iter_block_children(block_id: str, page_size=100):
+    """
+    자식 블록을 cursor 페이지네이션으로 전부 (100개 제한 ❌)
+    """
+    url = f"https://api.notion.com/v1/blocks/{block_id}/children"
+    params = {"page_size": page_size}
+
+    while True:
+        res = _request("GET", url, params=params)
+        res.raise_for_status()
+        data = res.json()
+
+        yield from data.get("results", [])
+
+        if not data.get("has_more"):
+            return
+        params = {"page_size": page_size, "start_cursor": data.get("next_cursor")}
 
 
 def retrieve_page_blocks(page_id: str):
-    url = f"https://api.notion.com/v1/blocks/{page_id}/children?page_size=100"
-    res = _session.get(url, timeout=DEFAULT_TIMEOUT)
-    res.raise_for_status()
-    time.sleep(RATE_LIMIT_SLEEP)
-    return res.json().get("results", [])
+    return list(iter_block_children(page_id))
 
 
-def find_blocks_with_text(page_id: str, keyword: str):
-    url = f"https://api.notion.com/v1/blocks/{page_id}/children?page_size=100"
-    res = _session.get(url, timeout=DEFAULT_TIMEOUT)
-    res.raise_for_status()
+def retrieve_page_blocks_cached(page_id: str):
+    """
+    retrieve_page_blocks + TTL 캐시 (쓰기 helper 들이 자동 무효화)
+    """
+    blocks = cache.children_cache.get(page_id)
+    if blocks is None:
+        blocks = retrieve_page_blocks(page_id)
+        cache.remember_children(page_id, blocks)
+    return blocks
+
 
-    blocks = res.json().get("results", [])
+def find_blocks_with_text(page_id: str, keyword: str):
     matched = []
 
-    for b in blocks:
+    for b in iter_block_children(page_id):
         if b["type"] == "paragraph":
             texts = b["paragraph"]["rich_text"]
             content = "".join(t["plain_text"] for t in texts)
             if keyword in content:
                 matched.append(b["id"])
 
-    time.sleep(RATE_LIMIT_SLEEP)
     return matched
 
+def build_link_paragraph(*, title: str, url: str, time_text: str) -> dict:
+    """
+    NEW 댓글 알림 paragraph 블록
+    """
+    return {
+        "object": "block",
+        "type": "paragraph",
+        "paragraph": {
+            "rich_text": [
+                {
+                    "type": "text",
+                    "text": {"content": "🔴 NEW 댓글!!\n"}
+                },
+                {
+                    "type": "text",
+                    "text": {"content": f"• 제목: {title}\n"}
+                },
+                {
+                    "type": "text",
+                    "text": {"content": f"• 시간: {time_text}\n"}
+                },
+                {
+                    "type": "text",
+                    "text": {
+                        "content": "• 링크 바로가기",
+                        "link": {"url": url}
+                    }
+                },
+            ]
+        }
+    }
+
+
 def append_link_block_to_block(block_id: str, *, title: str, url: str, time_text: str):
     endpoint = f"https://api.notion.com/v1/blocks/{block_id}/children"
 
     payload = {
         "children": [
-            {
-                "object": "block",
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {"content": "🔴 NEW 댓글!!\n"}
-                        },
-                        {
-                            "type": "text",
-                            "text": {"content": f"• 제목: {title}\n"}
-                        },
-                        {
-                            "type": "text",
-                            "text": {"content": f"• 시간: {time_text}\n"}
-                        },
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": "• 링크 바로가기",
-                                "link": {"url": url}
-                            }
-                        },
-                    ]
-                }
-            }
+            build_link_paragraph(title=title, url=url, time_text=time_text)
         ]
     }
 
     try:
-        res = _session.patch(endpoint, json=payload, timeout=DEFAULT_TIMEOUT)
+        res = _request("PATCH", endpoint, json=payload)
         res.raise_for_status()
-        time.sleep(RATE_LIMIT_SLEEP)
     except requests.exceptions.RequestException as e:
-        print("⚠️ append_link_block 실패:", e)
\ No newline at end of file
+        print("⚠️ append_link_block 실패:", e)
+    finally:
+        cache.invalidate(block_id)
+
+
+MAX_CHILDREN_PER_APPEND = 100   # Notion append children 1회 최대
+
+
+class PartialAppendError(requests.exceptions.RequestException):
+    """
+    append_children 도중 실패 → appended: 이미 추가된 블록 수 (앞쪽부터)
+    """
+
+    def __init__(self, appended, cause):
+        super().__init__(f"{appended}개 추가 후 실패: {cause}")
+        self.appended = appended
+        self.cause = cause
+
+
+def append_children(block_id: str, children: list, chunk_size=MAX_CHILDREN_PER_APPEND):
+    """
+    여러 블록을 한 번에 추가 (chunk_size 개씩 나눠서 PATCH)
+    실패 시 PartialAppendError → .appended 개(앞쪽부터)는 이미 추가된 상태
+    return: 추가한 블록 수
+    """
+    endpoint = f"https://api.notion.com/v1/blocks/{block_id}/children"
+    appended = 0
+
+    try:
+        for i in range(0, len(children), chunk_size):
+            chunk = children[i:i + chunk_size]
+            try:
+                res = _request("PATCH", endpoint, json={"children": chunk})
+                res.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                raise PartialAppendError(appended, e) from e
+            appended += len(chunk)
+    finally:
+        cache.invalidate(block_id)
+
+    return appended
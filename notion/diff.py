@@ -0,0 +1,67 @@
+"""
+Notion 속성 diff → 실제로 바뀐 필드만 PATCH
+
+- update 형태({"number": 3}, {"status": {"name": ...}}, ...) → 비교용 값으로 변환
+- 현재 값(PageRecord.property_values)과 같으면 제외
+- last_run 만 바뀐 경우 → LAST_RUN_TOUCH_HOURS 주기로만 기록
+"""
+import os
+from datetime import datetime, timezone, timedelta
+
+DIFF_UPDATES = os.environ.get("NOTION_DIFF_UPDATES", "1") == "1"
+LAST_RUN_TOUCH_HOURS = float(os.environ.get("NOTION_LAST_RUN_TOUCH_HOURS", 24))
+
+
+def plain_value(value):
+    """
+    update 속성 값 → 비교용 값 (알 수 없는 형태면 원본 그대로 → 항상 변경으로 취급)
+    """
+    if "number" in value:
+        return value["number"]
+    if "checkbox" in value:
+        return bool(value["checkbox"])
+    if "status" in value:
+        return (value["status"] or {}).get("name")
+    if "select" in value:
+        return (value["select"] or {}).get("name")
+    if "url" in value:
+        return value["url"]
+    if "rich_text" in value:
+        return "".join(
+            t.get("plain_text") or t.get("text", {}).get("content", "")
+            for t in value["rich_text"] or []
+        )
+    if "date" in value:
+        return (value["date"] or {}).get("start")
+    return value
+
+
+def diff_properties(current: dict, updates: dict) -> dict:
+    """
+    current: {속성명: 비교용 값}
+    → current 에 없거나 값이 다른 속성만
+    """
+    return {
+        name: value
+        for name, value in updates.items()
+        if name not in current or current[name] != plain_value(value)
+    }
+
+
+def strip_unchanged(current: dict, updates: dict, last_run_prop=None, last_run=None, now=None) -> dict:
+    """
+    바뀐 필드만 남김
+    - 다른 필드가 바뀌면 last_run 도 같이 (어차피 PATCH 1회)
+    - last_run 만 남으면 → 이전 기록이 LAST_RUN_TOUCH_HOURS 이상 지났을 때만
+    """
+    if not DIFF_UPDATES:
+        return updates
+
+    changed = diff_properties(current, updates)
+
+    if last_run_prop and set(changed) == {last_run_prop} and last_run:
+        now = now or datetime.now(timezone.utc)
+        if now - last_run < timedelta(hours=LAST_RUN_TOUCH_HOURS):
+            return {}
+
+    return changed
@@ -103,4 +103,86 @@ def get_people_ids(page, prop_name: str):
         people = page["properties"][prop_name]["people"]
         return [p["id"] for p in people]
     except Exception:
-        return []
\ No newline at end of file
+        return []
+
+# =========================
+# 📦 파싱된 페이지 (raw JSON 미보관)
+# =========================
+POST_DATE_PROP = "날짜"
+POST_TITLE_PROP = "글 제목"
+EXTERNAL_COUNT_PROP = "외부 댓글 수"
+
+
+class PageRecord:
+    """
+    NOTION_DBS 설정(cfg) 기준으로 페이지를 한 번만 파싱한 레코드
+    - 날짜/숫자/relation/상태를 미리 변환
+    - properties 원본은 버림 → 메모리 ↓, 속성 접근 = 속성 읽기
+    """
+
+    __slots__ = (
+        "id",
+        "last_edited_time",
+        "url",
+        "status",
+        "count",
+        "external_count",
+        "view",
+        "new",
+        "refresh_flag",
+        "hospital_ids",
+        "post_date",
+        "last_run",
+        "title",
+    )
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def from_page(cls, page, cfg):
+        def prop(key):
+            return cfg.get(key)
+
+        return cls(
+            id=page["id"],
+            last_edited_time=page.get("last_edited_time"),
+            url=get_url(page, prop("url")),
+            status=get_select(page, prop("status")),
+            count=get_number(page, prop("count")),
+            external_count=get_number(page, cfg.get("external_count", EXTERNAL_COUNT_PROP)),
+            view=get_number(page, prop("view")),
+            new=get_checkbox(page, prop("new")),
+            refresh_flag=get_checkbox(page, prop("db_refresh_flag")),
+            hospital_ids=tuple(get_relation_page_ids(page, prop("hospital_relation"))),
+            post_date=get_date(page, POST_DATE_PROP),
+            last_run=get_date(page, prop("last_run")),
+            title=_get_plain_text(page, POST_TITLE_PROP),
+        )
+
+    def property_values(self, cfg) -> dict:
+        """
+        기록 대상 속성의 현재 값 (notion.diff 비교용)
+        """
+        values = {
+            cfg.get("status"): self.status,
+            cfg.get("count"): self.count,
+            cfg.get("external_count", EXTERNAL_COUNT_PROP): self.external_count,
+            cfg.get("view"): self.view,
+            cfg.get("new"): bool(self.new),
+            cfg.get("db_refresh_flag"): bool(self.refresh_flag),
+            POST_TITLE_PROP: self.title,
+        }
+        values.pop(None, None)
+        return values
+
+    def __repr__(self):
+        return f"PageRecord(id={self.id!r}, status={self.status!r}, url={self.url!r})"
+
+
+def _get_plain_text(page, prop):
+    try:
+        return get_rich_text(page, prop)
+    except Exception:
+        return None
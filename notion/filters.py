@@ -0,0 +1,49 @@
+"""
+Notion database query filter 빌더
+"""
+
+
+def and_(*filters):
+    # 중첩 and 는 펼침 (Notion compound filter 는 2단계까지만 허용)
+    flat = []
+    for f in filters:
+        if f and "and" in f:
+            flat.extend(f["and"])
+        elif f:
+            flat.append(f)
+    filters = flat
+    if not filters:
+        return None
+    if len(filters) == 1:
+        return filters[0]
+    return {"and": filters}
+
+
+def or_(*filters):
+    filters = [f for f in filters if f]
+    if not filters:
+        return None
+    if len(filters) == 1:
+        return filters[0]
+    return {"or": filters}
+
+
+def status_equals(prop: str, name: str):
+    return {"property": prop, "status": {"equals": name}}
+
+
+def checkbox_equals(prop: str, value: bool = True):
+    return {"property": prop, "checkbox": {"equals": value}}
+
+
+def date_on_or_after(prop: str, iso: str):
+    return {"property": prop, "date": {"on_or_after": iso}}
+
+
+def date_is_empty(prop: str):
+    return {"property": prop, "date": {"is_empty": True}}
+
+
+def edited_since(iso: str):
+    """last_edited_time >= iso"""
+    return {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": iso}}
@@ -0,0 +1,127 @@
+"""
+증분 조회: DB 별 last_edited_time high-water mark 를 로컬에 저장하고
+그 이후 수정된 페이지만 받아온다.
+"""
+import threading
+from datetime import datetime, timezone
+
+from notion.client import query_database
+from notion.filters import and_, edited_since
+from utils.local_db import get_connection, ensure_schema
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notion_sync_cursor (
+    database_id TEXT PRIMARY KEY,
+    last_edited_time TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+def load_cursor(database_id: str) -> str | None:
+    ensure_schema("notion_sync_cursor", _SCHEMA)
+    row = get_connection().execute(
+        "SELECT last_edited_time FROM notion_sync_cursor WHERE database_id = ?",
+        (database_id,),
+    ).fetchone()
+    return row["last_edited_time"] if row else None
+
+
+def save_cursor(database_id: str, last_edited_time: str | None):
+    if not last_edited_time:
+        return
+
+    ensure_schema("notion_sync_cursor", _SCHEMA)
+    conn = get_connection()
+    conn.execute(
+        """
+        INSERT INTO notion_sync_cursor (database_id, last_edited_time, updated_at)
+        VALUES (?, ?, ?)
+        ON CONFLICT(database_id) DO UPDATE SET
+            last_edited_time = excluded.last_edited_time,
+            updated_at = excluded.updated_at
+        """,
+        (database_id, last_edited_time, datetime.now(timezone.utc).isoformat()),
+    )
+    conn.commit()
+
+
+def reset_cursor(database_id: str):
+    ensure_schema("notion_sync_cursor", _SCHEMA)
+    conn = get_connection()
+    conn.execute("DELETE FROM notion_sync_cursor WHERE database_id = ?", (database_id,))
+    conn.commit()
+
+
+def max_last_edited(pages, current: str | None = None) -> str | None:
+    # ISO8601(UTC, 'Z') 문자열은 사전순 = 시간순
+    stamps = [p.get("last_edited_time") for p in pages if p.get("last_edited_time")]
+    if current:
+        stamps.append(current)
+    return max(stamps) if stamps else None
+
+
+class IncrementalCursor:
+    """
+    DB 1개의 증분 커서
+    - 조회한 페이지들의 last_edited_time 최댓값까지 전진
+    - hold(page_id): 이번 실행에서 기록 못 한 페이지 (스킵 / 실패 / 쓰기 실패)
+      → 커서가 그 페이지를 넘어가지 않음 → 다음 실행에서 다시 조회
+    - save() 는 write-behind 큐 flush 이후에 호출
+    """
+
+    def __init__(self, database_id: str, current: str | None = None, pages=()):
+        self.database_id = database_id
+        self.current = current
+        self._edited = {
+            p["id"]: p["last_edited_time"] for p in pages if p.get("last_edited_time")
+        }
+        self._held = set()
+        self._lock = threading.Lock()
+
+    def hold(self, page_id: str):
+        with self._lock:
+            if page_id in self._edited:
+                self._held.add(page_id)
+
+    @property
+    def value(self) -> str | None:
+        with self._lock:
+            cursor = max_last_edited(
+                [{"last_edited_time": t} for t in self._edited.values()], self.current
+            )
+            held = [self._edited[page_id] for page_id in self._held]
+        # on_or_after 조회 → 가장 이른 미기록 페이지 시각에 멈추면 그 페이지부터 다시 받음
+        return min([cursor, *held]) if held else cursor
+
+    def save(self):
+        save_cursor(self.database_id, self.value)
+
+
+def save_cursors(cursors, failed=()):
+    """
+    failed: WriteBehindQueue.failed → 쓰기 실패 페이지도 다음 실행에서 다시 조회
+    """
+    failed_ids = [page_id for page_id, *_ in failed]
+    for cursor in cursors:
+        if cursor is None:
+            continue
+        for page_id in failed_ids:
+            cursor.hold(page_id)
+        cursor.save()
+
+
+def query_changed_pages(database_id: str, filter=None):
+    """
+    마지막 커서 이후 수정된 페이지만 조회
+    return: (pages, cursor: IncrementalCursor)
+        → 처리 중 기록 못 한 페이지는 cursor.hold(page_id)
+        → 모든 기록이 끝난 뒤 save_cursors([cursor], writer.failed)
+    """
+    current = load_cursor(database_id)
+
+    # Notion last_edited_time 은 분 단위 → on_or_after 로 경계 페이지 재조회 (중복은 무해)
+    flt = and_(filter, edited_since(current)) if current else filter
+    pages = query_database(database_id, filter=flt)
+
+    return pages, IncrementalCursor(database_id, current, pages)
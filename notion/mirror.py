@@ -0,0 +1,329 @@
+"""
+Notion 페이지 로컬 미러 (SQLite 읽기 캐시)
+
+- sync_database(): 마지막 동기화 이후 수정된 페이지만 받아 upsert
+  (FULL_SYNC_HOURS 마다 전체 조회 → 삭제/보관된 페이지 정리)
+- get_pages() / iter_pages(): Notion API 응답과 같은 모양의 dict 반환
+  → notion.fetch 접근자(get_url, get_checkbox, ...) 그대로 사용
+  → iter_pages(sync=True) 는 동기화로 받는 페이지를 받는 대로 먼저 흘려보내고
+    나머지(변경 없는 페이지)는 동기화가 끝난 뒤 로컬에서 읽음
+- find_pages(): 속성 값 인덱스 조회 (예: NEW 체크된 페이지)
+- NOTION_MIRROR=0 → 미러 없이 매번 서버 조회 (같은 함수 그대로 사용)
+
+❗ 롤업 / 수식 값은 관련 페이지가 바뀌어도 이 페이지의 last_edited_time 이
+   바뀌지 않아 증분 동기화에 안 잡힘 → 최대 FULL_SYNC_HOURS 만큼 낡을 수 있음
+   (롤업이 필요하면 서버에서 조회할 것 → 예: notify_new_comments)
+"""
+import json
+import os
+from datetime import datetime, timezone, timedelta
+
+from notion.client import iter_database
+from notion.filters import checkbox_equals, edited_since
+from notion.incremental import max_last_edited
+from utils.local_db import get_connection, ensure_schema
+
+# 로컬 미러 사용 여부 → NOTION_MIRROR=0 이면 매번 서버 조회
+MIRROR_ENABLED = os.environ.get("NOTION_MIRROR", "1") == "1"
+FULL_SYNC_HOURS = int(os.environ.get("NOTION_MIRROR_FULL_SYNC_HOURS", 24))
+SYNC_BATCH_SIZE = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notion_pages (
+    page_id TEXT PRIMARY KEY,
+    database_id TEXT NOT NULL,
+    last_edited_time TEXT,
+    properties TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_notion_pages_db ON notion_pages (database_id);
+
+CREATE TABLE IF NOT EXISTS notion_page_props (
+    page_id TEXT NOT NULL,
+    database_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT,
+    value_text TEXT,
+    value_num REAL,
+    PRIMARY KEY (page_id, name)
+);
+CREATE INDEX IF NOT EXISTS idx_notion_page_props_lookup
+    ON notion_page_props (database_id, name, value_text, value_num);
+
+CREATE TABLE IF NOT EXISTS notion_mirror_state (
+    database_id TEXT PRIMARY KEY,
+    last_edited_time TEXT,
+    full_synced_at TEXT
+);
+"""
+
+
+def _schema():
+    ensure_schema("notion_mirror", _SCHEMA)
+    return get_connection()
+
+
+# =========================
+# 속성 → (type, text, num)
+# =========================
+def _typed_value(prop):
+    t = prop.get("type")
+    v = prop.get(t) if t else None
+
+    if t in ("number",):
+        return t, None, v
+    if t == "checkbox":
+        return t, None, 1 if v else 0
+    if t in ("status", "select"):
+        return t, (v or {}).get("name"), None
+    if t == "date":
+        return t, (v or {}).get("start"), None
+    if t in ("url", "email", "phone_number"):
+        return t, v, None
+    if t in ("title", "rich_text"):
+        return t, "".join(x.get("plain_text", "") for x in (v or [])), None
+    if t == "relation":
+        return t, json.dumps([r["id"] for r in (v or [])]), None
+    if t in ("created_time", "last_edited_time"):
+        return t, v, None
+    return t, None, None
+
+
+def _upsert(conn, database_id, pages):
+    for p in pages:
+        if p.get("archived") or p.get("in_trash"):
+            _delete(conn, [p["id"]])
+            continue
+
+        props = p.get("properties", {})
+        conn.execute(
+            """
+            INSERT INTO notion_pages (page_id, database_id, last_edited_time, properties)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(page_id) DO UPDATE SET
+                database_id = excluded.database_id,
+                last_edited_time = excluded.last_edited_time,
+                properties = excluded.properties
+            """,
+            (p["id"], database_id, p.get("last_edited_time"),
+             json.dumps(props, ensure_ascii=False)),
+        )
+        conn.execute("DELETE FROM notion_page_props WHERE page_id = ?", (p["id"],))
+        conn.executemany(
+            """
+            INSERT INTO notion_page_props
+                (page_id, database_id, name, type, value_text, value_num)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (p["id"], database_id, name, *_typed_value(prop))
+                for name, prop in props.items()
+            ],
+        )
+
+
+def _delete(conn, page_ids):
+    for pid in page_ids:
+        conn.execute("DELETE FROM notion_pages WHERE page_id = ?", (pid,))
+        conn.execute("DELETE FROM notion_page_props WHERE page_id = ?", (pid,))
+
+
+def _needs_full_sync(state) -> bool:
+    if not state or not state["full_synced_at"]:
+        return True
+    last = datetime.fromisoformat(state["full_synced_at"])
+    return datetime.now(timezone.utc) - last > timedelta(hours=FULL_SYNC_HOURS)
+
+
+# =========================
+# 🔄 동기화
+# =========================
+def sync_database(database_id: str, full: bool = False) -> int:
+    """
+    미러 갱신 → 받아온 페이지 수 반환
+    """
+    count = 0
+    for _ in iter_sync(database_id, full=full):
+        count += 1
+    return count
+
+
+def iter_sync(database_id: str, full: bool = False):
+    """
+    미러 갱신하면서 받아온 페이지를 바로 yield (보관/삭제된 페이지 포함)
+    끝까지 소비해야 동기화 상태(high-water mark)가 저장됨
+    """
+    conn = _schema()
+    state = conn.execute(
+        "SELECT * FROM notion_mirror_state WHERE database_id = ?",
+        (database_id,),
+    ).fetchone()
+
+    full = full or _needs_full_sync(state)
+    cursor = None if full else state["last_edited_time"]
+
+    pages = iter_database(
+        database_id,
+        filter=edited_since(cursor) if cursor else None,
+        prefetch=True,
+    )
+    now = datetime.now(timezone.utc).isoformat()
+
+    # 배치 단위로 바로 저장 → 메모리에는 id 집합만 남음
+    alive = set()
+    high_water = cursor
+    batch = []
+
+    def flush():
+        nonlocal high_water
+        with conn:
+            _upsert(conn, database_id, batch)
+        high_water = max_last_edited(batch, high_water)
+        batch.clear()
+
+    for p in pages:
+        alive.add(p["id"])
+        batch.append(p)
+        yield p
+        if len(batch) >= SYNC_BATCH_SIZE:
+            flush()
+    if batch:
+        flush()
+
+    with conn:
+        if full:
+            stale = [
+                r["page_id"] for r in conn.execute(
+                    "SELECT page_id FROM notion_pages WHERE database_id = ?",
+                    (database_id,),
+                )
+                if r["page_id"] not in alive
+            ]
+            _delete(conn, stale)
+
+        conn.execute(
+            """
+            INSERT INTO notion_mirror_state (database_id, last_edited_time, full_synced_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(database_id) DO UPDATE SET
+                last_edited_time = excluded.last_edited_time,
+                full_synced_at = COALESCE(excluded.full_synced_at, full_synced_at)
+            """,
+            (
+                database_id,
+                high_water,
+                now if full else None,
+            ),
+        )
+
+    print(f"🗂 미러 동기화 ({'전체' if full else '증분'}): {database_id} → {len(alive)}건")
+
+
+# =========================
+# 📖 조회
+# =========================
+def _row_to_page(row):
+    return {
+        "object": "page",
+        "id": row["page_id"],
+        "last_edited_time": row["last_edited_time"],
+        "properties": json.loads(row["properties"]),
+    }
+
+
+def _matches(page, prop, value) -> bool:
+    _, text, num = _typed_value(page.get("properties", {}).get(prop, {}))
+    if isinstance(value, bool):
+        return num == int(value)
+    if isinstance(value, (int, float)):
+        return num == value
+    return text == value
+
+
+def _iter_remote(database_id, prop, value):
+    """
+    미러 미사용 → 서버 조회 (checkbox 는 서버 필터, 그 외는 받아서 거름)
+    """
+    flt = checkbox_equals(prop, value) if isinstance(value, bool) else None
+    for p in iter_database(database_id, filter=flt, prefetch=True):
+        if prop is None or _matches(p, prop, value):
+            yield p
+
+
+def iter_pages(database_id: str, prop: str | None = None, value=None, sync: bool = True):
+    """
+    미러에서 한 행씩 읽어 yield (전체를 메모리에 올리지 않음)
+    prop 지정 시 속성 값 인덱스 조회
+    - checkbox/number → value_num, 그 외 → value_text
+    sync=True → 동기화로 받는 페이지부터 바로 yield, 끝나면 나머지를 미러에서
+    NOTION_MIRROR=0 → 서버에서 바로 조회
+    """
+    if not MIRROR_ENABLED:
+        yield from _iter_remote(database_id, prop, value)
+        return
+
+    seen = set()
+    if sync:
+        for p in iter_sync(database_id):
+            seen.add(p["id"])
+            if p.get("archived") or p.get("in_trash"):
+                continue
+            if prop is None or _matches(p, prop, value):
+                yield p
+
+    for page in _iter_local(database_id, prop, value):
+        if page["id"] not in seen:
+            yield page
+
+
+def _iter_local(database_id, prop, value):
+    conn = _schema()
+
+    if prop is None:
+        rows = conn.execute(
+            "SELECT * FROM notion_pages WHERE database_id = ?",
+            (database_id,),
+        )
+    else:
+        if isinstance(value, bool):
+            column, value = "value_num", int(value)
+        elif isinstance(value, (int, float)):
+            column = "value_num"
+        else:
+            column = "value_text"
+
+        rows = conn.execute(
+            f"""
+            SELECT p.* FROM notion_page_props v
+            JOIN notion_pages p ON p.page_id = v.page_id
+            WHERE v.database_id = ? AND v.name = ? AND v.{column} = ?
+            """,
+            (database_id, prop, value),
+        )
+
+    for r in rows:
+        yield _row_to_page(r)
+
+
+def get_page(page_id: str):
+    """
+    미러에 있는 페이지 1개 (없으면 None, 동기화 ❌)
+    """
+    row = _schema().execute(
+        "SELECT * FROM notion_pages WHERE page_id = ?",
+        (page_id,),
+    ).fetchone()
+    return _row_to_page(row) if row else None
+
+
+def get_pages(database_id: str, sync: bool = True):
+    """
+    query_database() 대체: 미러 갱신 후 로컬에서 읽기
+    """
+    return list(iter_pages(database_id, sync=sync))
+
+
+def find_pages(database_id: str, prop: str, value, sync: bool = True):
+    """
+    속성 값이 일치하는 페이지만 (인덱스 조회)
+    """
+    return list(iter_pages(database_id, prop, value, sync=sync))
@@ -0,0 +1,119 @@
+"""
+프로세스 공용 Notion rate limiter (token bucket)
+
+- 평균 rate req/s, 최대 burst 개까지 몰아서 허용
+- 429 / 502 / 503 → Retry-After 만큼 전체 정지 + 속도 절반 (AIMD)
+- 성공 시 조금씩 원래 속도로 복구
+- 프로세스 안 모든 스레드가 공유
+"""
+import os
+import threading
+import time
+
+NOTION_RATE = float(os.environ.get("NOTION_REQUESTS_PER_SEC", 3))
+NOTION_BURST = int(os.environ.get("NOTION_BURST", 6))
+
+RETRY_STATUS = {429, 502, 503}
+
+
+def parse_retry_after(value, default=None):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class TokenBucket:
+    def __init__(self, rate=NOTION_RATE, burst=NOTION_BURST, min_rate=0.3, recover_step=0.05):
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.recover_step = recover_step
+        self.burst = max(1, burst)
+
+        self._rate = rate
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        # 📊 metrics
+        self._requests = 0
+        self._throttled = 0
+        self._total_wait = 0.0
+        self._last_wait = 0.0
+
+    def _refill(self, now):
+        if now > self._last:
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self._rate)
+            self._last = now
+
+    def reserve(self) -> float:
+        """
+        토큰 1개 예약 → 기다려야 할 초 반환
+        (예약이므로 반환값만큼 기다린 뒤 바로 요청하면 됨)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+
+            wait = max(0.0, self._blocked_until - now)
+            if self._tokens < 0:
+                wait += -self._tokens / self._rate
+
+            self._requests += 1
+            self._total_wait += wait
+            self._last_wait = wait
+            return wait
+
+    def _blocked_wait(self) -> float:
+        """
+        대기 중에 penalize 로 정지 시각이 늦춰졌으면 남은 초 (아니면 0)
+        """
+        with self._lock:
+            return max(0.0, self._blocked_until - time.monotonic())
+
+    def acquire(self):
+        wait = self.reserve()
+        while wait > 0:
+            time.sleep(wait)
+            wait = self._blocked_wait()
+
+    def penalize(self, retry_after=None):
+        """
+        429 / 5xx 응답 → 속도 절반 + Retry-After 동안 전체 정지
+        """
+        with self._lock:
+            now = time.monotonic()
+            # 지금까지 쌓인 토큰 먼저 반영 → 정지 동안은 충전 ❌
+            self._refill(now)
+            self._throttled += 1
+            self._rate = max(self.min_rate, self._rate / 2)
+
+            delay = retry_after if retry_after is not None else 1.0 / self._rate
+            self._blocked_until = max(self._blocked_until, now + delay)
+            self._tokens = min(self._tokens, 0.0)
+            self._last = max(self._last, self._blocked_until)
+
+    def reward(self):
+        with self._lock:
+            if self._rate < self.max_rate:
+                self._rate = min(self.max_rate, self._rate + self.recover_step)
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "rate": round(self._rate, 3),
+                "requests": self._requests,
+                "throttled": self._throttled,
+                "total_wait_sec": round(self._total_wait, 2),
+                "avg_wait_sec": round(self._total_wait / self._requests, 3) if self._requests else 0.0,
+                "last_wait_sec": round(self._last_wait, 3),
+            }
+
+
+notion_limiter = TokenBucket()
@@ -0,0 +1,172 @@
+"""
+Notion write-behind 큐
+
+- 같은 페이지에 대한 여러 속성 업데이트 → PATCH 1회로 합침
+- 워커 여러 개가 동시에 flush (속도는 notion.rate_limit 이 제한)
+- 네트워크 오류는 backoff 재시도, 영구 실패는 실행 끝에 report()
+"""
+import os
+import threading
+import time
+
+import requests
+
+from notion.client import patch_page
+
+WRITE_WORKERS = int(os.environ.get("NOTION_WRITE_WORKERS", 3))
+MAX_RETRY = 4
+COALESCE_DELAY = 0.5     # 초: 이 시간 동안 들어온 같은 페이지 업데이트는 합쳐짐
+MAX_PENDING = 500        # 초과 시 enqueue 대기 (메모리 / backpressure)
+
+
+def _is_permanent(e) -> bool:
+    # 4xx (429 제외) → 재시도해도 같은 결과
+    res = getattr(e, "response", None)
+    return res is not None and 400 <= res.status_code < 500 and res.status_code != 429
+
+
+class WriteBehindQueue:
+    def __init__(self, workers=WRITE_WORKERS, max_retry=MAX_RETRY,
+                 coalesce_delay=COALESCE_DELAY, max_pending=MAX_PENDING, writer=patch_page):
+        self.max_retry = max_retry
+        self.coalesce_delay = coalesce_delay
+        self.max_pending = max_pending
+        self._writer = writer
+
+        self._pending = {}      # page_id → properties (합쳐진 값)
+        self._due = {}          # page_id → 전송 가능 시각
+        self._order = []        # 도착 순서
+        self._in_flight = set()
+        self._cond = threading.Condition()
+        self._flushing = False
+        self._closed = False
+
+        # 📊
+        self.enqueued = 0
+        self.coalesced = 0
+        self.written = 0
+        self.failed = []        # (page_id, properties, error)
+
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"notion-writer-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for t in self._threads:
+            t.start()
+
+    # =========================
+    # 입력
+    # =========================
+    def enqueue(self, page_id, properties):
+        if not properties:
+            return
+
+        with self._cond:
+            self.enqueued += 1
+
+            # 자리가 날 때까지 대기 (그 사이 다른 스레드가 같은 페이지를 넣었으면 합침)
+            self._cond.wait_for(
+                lambda: page_id in self._pending or len(self._pending) < self.max_pending
+            )
+
+            if page_id in self._pending:
+                self._pending[page_id].update(properties)
+                self.coalesced += 1
+                return
+
+            self._pending[page_id] = dict(properties)
+            self._due[page_id] = time.monotonic() + self.coalesce_delay
+            self._order.append(page_id)
+            self._cond.notify_all()
+
+    # =========================
+    # 워커
+    # =========================
+    def _take(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                next_due = None
+
+                for i, page_id in enumerate(self._order):
+                    # 같은 페이지 PATCH 는 순서 보장 (동시 전송 ❌)
+                    if page_id in self._in_flight:
+                        continue
+
+                    due = self._due[page_id]
+                    if due <= now or self._flushing:
+                        del self._order[i]
+                        self._due.pop(page_id)
+                        props = self._pending.pop(page_id)
+                        self._in_flight.add(page_id)
+                        self._cond.notify_all()
+                        return page_id, props
+
+                    next_due = due if next_due is None else min(next_due, due)
+
+                if self._closed and not self._order:
+                    return None
+
+                self._cond.wait(None if next_due is None else next_due - now)
+
+    def _write(self, page_id, props):
+        for attempt in range(1, self.max_retry + 1):
+            try:
+                self._writer(page_id, props)
+                with self._cond:
+                    self.written += 1
+                return
+            except requests.exceptions.RequestException as e:
+                if _is_permanent(e) or attempt == self.max_retry:
+                    print("❌ Notion update failed permanently:", page_id, e)
+                    with self._cond:
+                        self.failed.append((page_id, props, e))
+                    return
+
+                print(f"⚠️ Notion update retry {attempt}/{self.max_retry}:", e)
+                time.sleep(1.5 * 2 ** (attempt - 1))
+
+    def _worker(self):
+        while True:
+            item = self._take()
+            if item is None:
+                return
+
+            page_id, props = item
+            try:
+                self._write(page_id, props)
+            except Exception as e:
+                print("❌ Notion update 예외:", page_id, e)
+                with self._cond:
+                    self.failed.append((page_id, props, e))
+            finally:
+                with self._cond:
+                    self._in_flight.discard(page_id)
+                    self._cond.notify_all()
+
+    # =========================
+    # 종료
+    # =========================
+    def flush(self):
+        """대기 중인 업데이트 모두 즉시 전송 후 완료까지 대기"""
+        with self._cond:
+            self._flushing = True
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: not self._order and not self._in_flight)
+            self._flushing = False
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join()
+
+    def report(self):
+        print(
+            f"📝 Notion 쓰기: 요청 {self.enqueued}건 → PATCH {self.written}건 "
+            f"(합쳐짐 {self.coalesced}, 실패 {len(self.failed)})"
+        )
+        for page_id, props, e in self.failed:
+            print("   ❌", page_id, list(props), e)
@@ -3,10 +3,17 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from datetime import datetime, timedelta, timezone
-import time
+
+from collections import defaultdict
+
+import requests
 
 from notion.client import query_database, update_page
+from notion.mirror import get_pages
+from notion.batch import run_batch
+from notion.filters import date_on_or_after
 from notion.fetch import (
+    PageRecord,
     get_relation_page_ids,
     get_date,
 )
@@ -16,7 +23,6 @@ from config.notion_mapping import NOTION_DBS
 # =========================
 # ⏱ 설정값
 # =========================
-RATE_LIMIT_SLEEP = 0.3
 LOOKBACK_DAYS = 7  # 최근 N일 업무일지만 확인
 
 # =========================
@@ -46,13 +52,6 @@ DAILY_WORKLOG_DBS = {
 # =========================
 DAILY_HOSPITAL_PROP = "병원 연동"   # Relation → 병원 DB
 DAILY_DATE_PROP = "날짜"            # Date
-POST_DATE_PROP = "날짜"             # Date
-
-
-def same_day(d1, d2):
-    if not d1 or not d2:
-        return False
-    return d1.date() == d2.date()
 
 
 def extract_hospital_from_db_name(db_name: str):
@@ -66,21 +65,36 @@ def extract_hospital_from_db_name(db_name: str):
     return None
 
 
-def main():
-    print("\n🔁 auto_link_hospital START\n")
+def fetch_recent_worklogs(db_id: str, cutoff):
+    """
+    업무일지 DB 조회 (날짜 조건은 Notion 서버에서 필터)
+    """
+    try:
+        return query_database(
+            db_id,
+            filter=date_on_or_after(DAILY_DATE_PROP, cutoff.date().isoformat()),
+        )
+    except requests.exceptions.HTTPError as e:
+        print("⚠️ 날짜 필터 거부 → 전체 조회:", db_id, e)
+        return query_database(db_id)
 
-    cutoff = datetime.now(timezone.utc) - timedelta(days=LOOKBACK_DAYS)
 
-    # =========================
-    # 1️⃣ 최근 데일리 업무일지 수집
-    # =========================
-    recent_daily = []
+def build_daily_index(cutoff):
+    """
+    (병원명, 날짜) → 업무일지에 연결된 병원 relation id 집합
+    업무일지 DB 들은 동시에 조회
+    """
+    index = defaultdict(set)
 
-    for hospital_name, db_id in DAILY_WORKLOG_DBS.items():
-        try:
-            pages = query_database(db_id)
-        except Exception as e:
-            print(f"❌ 업무일지 DB 조회 실패: {hospital_name}", e)
+    results = run_batch(
+        lambda item: fetch_recent_worklogs(item[1], cutoff),
+        DAILY_WORKLOG_DBS.items(),
+        label="업무일지 DB 조회",
+    )
+
+    for (hospital_name, _), ok, pages in results:
+        if not ok:
+            print(f"❌ 업무일지 DB 조회 실패: {hospital_name}", pages)
             continue
 
         for p in pages:
@@ -94,12 +108,24 @@ def main():
             if not hospital_ids:
                 continue
 
-            p["_source_hospital"] = hospital_name
-            recent_daily.append(p)
+            index[(hospital_name, daily_date.date())].update(hospital_ids)
 
-    print(f"📘 최근 업무일지 수집 완료: {len(recent_daily)}건")
+    return index
 
-    if not recent_daily:
+
+def main():
+    print("\n🔁 auto_link_hospital START\n")
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=LOOKBACK_DAYS)
+
+    # =========================
+    # 1️⃣ 최근 데일리 업무일지 인덱스
+    # =========================
+    daily_index = build_daily_index(cutoff)
+
+    print(f"📘 최근 업무일지 수집 완료: {len(daily_index)}건 (병원·날짜 기준)")
+
+    if not daily_index:
         print("⛔ 기준 업무일지 없음 → 종료")
         return
 
@@ -118,36 +144,25 @@ def main():
         print(f"\n📕 처리 중: {name} (병원={current_hospital})")
 
         try:
-            pages = query_database(cfg["database_id"])
+            pages = get_pages(cfg["database_id"])
         except Exception as e:
             print(f"❌ DB 조회 실패: {name}", e)
             continue
 
         for page in pages:
-            page_id = page["id"]
+            record = PageRecord.from_page(page, cfg)
+            page_id = record.id
 
-            page_date = get_date(page, POST_DATE_PROP)
+            page_date = record.post_date
             if not page_date:
                 continue
 
             # 기존 병원 Relation
-            existing_ids = set(
-                get_relation_page_ids(page, cfg["hospital_relation"])
-            )
-
-            matched_ids = set()
+            existing_ids = set(record.hospital_ids)
 
-            for daily in recent_daily:
-                daily_date = get_date(daily, DAILY_DATE_PROP)
-
-                if (
-                    same_day(page_date, daily_date)
-                    and daily.get("_source_hospital") == current_hospital
-                ):
-                    daily_hospital_ids = get_relation_page_ids(
-                        daily, DAILY_HOSPITAL_PROP
-                    )
-                    matched_ids.update(daily_hospital_ids)
+            matched_ids = daily_index.get(
+                (current_hospital, page_date.date()), set()
+            )
 
             new_ids = matched_ids - existing_ids
 
@@ -171,8 +186,6 @@ def main():
                 f"병원={current_hospital}"
             )
 
-            time.sleep(RATE_LIMIT_SLEEP)
-
     print("\n🔁 auto_link_hospital END\n")
 
 
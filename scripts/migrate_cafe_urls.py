@@ -1,7 +1,6 @@
 import os
 import sys
 import re
-import time
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, BASE_DIR)
@@ -9,12 +8,15 @@ sys.path.insert(0, BASE_DIR)
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
 from notion.client import query_database, update_page
 from notion.fetch import get_url
 from config.notion_mapping import NOTION_DBS
+from crawler.waits import URL_WAIT_TIMEOUT, timed_wait, wait_metrics
+
+RESOLVED_URL_PATTERN = r"cafes/(\d+)/articles/(\d+)"
 
 
 def extract_clubid_mobile_url(driver, raw_url: str):
@@ -49,10 +51,17 @@ def extract_clubid_mobile_url(driver, raw_url: str):
         try:
             print("  ▶ try:", u)
             driver.get(u)
-            time.sleep(2)
+
+            # 리다이렉트로 cafes/<clubid>/articles/<id> 형태가 되는 즉시 진행
+            timed_wait(
+                driver,
+                EC.url_matches(RESOLVED_URL_PATTERN),
+                URL_WAIT_TIMEOUT,
+                "migrate_url",
+            )
 
             cur = driver.current_url
-            m3 = re.search(r"cafes/(\d+)/articles/(\d+)", cur)
+            m3 = re.search(RESOLVED_URL_PATTERN, cur)
             if not m3:
                 continue
 
@@ -120,10 +129,10 @@ def main():
                     cfg["url"]: {"url": new_url}
                 })
                 print("✅ 변환 완료 →", new_url)
-                time.sleep(0.5)
 
     finally:
         driver.quit()
+        print("⏱ 대기 시간:", wait_metrics())
 
 
 if __name__ == "__main__":
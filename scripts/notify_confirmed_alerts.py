@@ -1,6 +1,5 @@
 import sys
 import os
-import time
 
 # =========================
 # 📌 경로 세팅 (config import 오류 방지)
@@ -8,13 +7,16 @@ import time
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, BASE_DIR)
 
+from collections import defaultdict
+
 from config.notion_mapping import NOTION_DBS
 from notion.client import (
-    query_database,
-    update_page,
+    patch_page,
     retrieve_page_blocks,
-    delete_block,
+    bulk_delete_blocks,
 )
+from notion.mirror import get_pages, find_pages
+from notion.batch import run_batch
 from notion.fetch import (
     get_checkbox,
     get_relation_page_ids,
@@ -23,8 +25,8 @@ from notion.fetch import (
 # =========================
 # ⏱ 설정값
 # =========================
-RATE_LIMIT = 0.5  # Notion DELETE 안정성 확보
 PRINT_PREFIX = "🧹"
+DELETE_CONCURRENCY = 6
 
 # =========================
 # 🏥 병원 DB 설정
@@ -39,12 +41,9 @@ HOSPITAL_CONFIRM_PROP = "알림 확인 완료"            # 체크박스 속성
 def find_alert_callout_block(page_id: str):
     """
     🔔 또는 '알림' 텍스트가 포함된 Callout 1개만 찾는다
+    ❗ 블록 조회 실패는 예외 그대로 → 호출자가 실패로 집계 (콜아웃 없음과 구분)
     """
-    try:
-        blocks = retrieve_page_blocks(page_id)
-    except Exception as e:
-        print("❌ 병원 블록 조회 실패:", page_id, e)
-        return None
+    blocks = retrieve_page_blocks(page_id)
 
     for b in blocks:
         if b.get("type") != "callout":
@@ -62,15 +61,42 @@ def find_alert_callout_block(page_id: str):
 
 
 # =========================
-# 🛡 안전한 블록 삭제
+# 📇 병원 id → NEW 페이지 인덱스
 # =========================
-def safe_delete_block(block_id: str):
-    try:
-        delete_block(block_id)
-        time.sleep(RATE_LIMIT)
-    except Exception as e:
-        # ❗ 삭제 실패해도 절대 중단하지 않음
-        print("⚠️ 블록 삭제 실패 (무시):", block_id, e)
+def build_new_page_index(target_ids):
+    """
+    여론/후기 DB 를 한 번씩만 읽어서
+    return: (hospital_id → [(page_id, new_prop), ...], 조회 실패한 DB 이름 목록)
+    """
+    index = defaultdict(list)
+    failed = []
+
+    for name, cfg in NOTION_DBS.items():
+        if "여론" not in name and "후기" not in name:
+            continue
+
+        try:
+            pages = find_pages(cfg["database_id"], cfg["new"], True)
+        except Exception as e:
+            print("⚠️ DB 조회 실패:", name, e)
+            failed.append(name)
+            continue
+
+        for p in pages:
+            for hospital_id in get_relation_page_ids(p, cfg["hospital_relation"]):
+                if hospital_id in target_ids:
+                    index[hospital_id].append((p["id"], cfg["new"]))
+
+    return index, failed
+
+
+def _callout_children(hospital_id):
+    alert_callout_id = find_alert_callout_block(hospital_id)
+    if not alert_callout_id:
+        print("⚠️ 알림 콜아웃 없음 → 스킵:", hospital_id)
+        return []
+
+    return [c["id"] for c in retrieve_page_blocks(alert_callout_id)]
 
 
 # =========================
@@ -80,8 +106,8 @@ def main():
     print(f"{PRINT_PREFIX} notify_confirmed_alerts START")
 
     # 1️⃣ 병원 DB 조회
-    hospitals = query_database(HOSPITAL_DB_ID)
-    targets = [h for h in hospitals if get_checkbox(h, HOSPITAL_CONFIRM_PROP)]
+    hospitals = get_pages(HOSPITAL_DB_ID)
+    targets = [h["id"] for h in hospitals if get_checkbox(h, HOSPITAL_CONFIRM_PROP)]
 
     print(f"{PRINT_PREFIX} 알림 정리 대상 병원 수: {len(targets)}")
 
@@ -89,78 +115,72 @@ def main():
         print("🔕 정리 대상 없음 → 종료")
         return
 
-    # 2️⃣ 병원별 처리
-    for hospital in targets:
-        hospital_id = hospital["id"]
-        print(f"\n🏥 병원 처리 시작: {hospital_id}")
-
-        # =========================
-        # A. 🔔 알림 Callout만 정리
-        # =========================
-        alert_callout_id = find_alert_callout_block(hospital_id)
-
-        if not alert_callout_id:
-            print("⚠️ 알림 콜아웃 없음 → 스킵")
-        else:
-            try:
-                children = retrieve_page_blocks(alert_callout_id)
-            except Exception as e:
-                print("⚠️ 알림 콜아웃 children 조회 실패:", e)
-                children = []
-
-            for c in children:
-                safe_delete_block(c["id"])
-
-            print("🧹 알림 콜아웃 정리 완료")
-
-        # =========================
-        # B. 여론 / 후기 NEW 해제
-        # =========================
-        for name, cfg in NOTION_DBS.items():
-            if "여론" not in name and "후기" not in name:
-                continue
-
-            try:
-                pages = query_database(cfg["database_id"])
-            except Exception as e:
-                print("⚠️ DB 조회 실패:", name, e)
-                continue
-
-            for p in pages:
-                if not get_checkbox(p, cfg["new"]):
-                    continue
-
-                hospital_ids = get_relation_page_ids(p, cfg["hospital_relation"])
-                if hospital_id not in hospital_ids:
-                    continue
-
-                try:
-                    update_page(
-                        p["id"],
-                        {cfg["new"]: {"checkbox": False}}
-                    )
-                    time.sleep(RATE_LIMIT)
-                except Exception as e:
-                    print("⚠️ NEW 체크 해제 실패:", p["id"], e)
-
-        print("🧹 여론/후기 NEW 체크 해제 완료")
-
-        # =========================
-        # C. 병원 알림 확인 체크 해제
-        # =========================
-        try:
-            update_page(
-                hospital_id,
-                {HOSPITAL_CONFIRM_PROP: {"checkbox": False}}
-            )
-            print("☑ 알림 확인 체크 해제 완료")
-        except Exception as e:
-            print("❌ 알림 확인 체크 해제 실패:", hospital_id, e)
-
-        time.sleep(RATE_LIMIT)
+    # =========================
+    # A. 🔔 알림 Callout 정리 (전체 병원 한 번에)
+    # =========================
+    found = run_batch(_callout_children, targets, label="알림 콜아웃 조회")
+    child_ids = [cid for _, ok, ids in found if ok for cid in ids]
+
+    # ❗ 삭제 실패해도 절대 중단하지 않음
+    deleted = bulk_delete_blocks(child_ids, concurrency=DELETE_CONCURRENCY)
+    failed = [block_id for block_id, ok, _ in deleted if not ok]
+    if failed:
+        print(f"⚠️ 알림 블록 삭제 실패 {len(failed)}건:", failed)
+    print("🧹 알림 콜아웃 정리 완료")
+
+    # 블록 조회 / 삭제 실패 병원 → 알림 확인 체크 유지 (다음 실행에서 재시도)
+    failed_ids = set(failed)
+    unfinished = {
+        hospital_id for hospital_id, ok, ids in found
+        if not ok or failed_ids.intersection(ids)
+    }
+
+    # =========================
+    # B. 여론 / 후기 NEW 해제 (DB 당 1회 조회)
+    # =========================
+    index, failed_dbs = build_new_page_index(set(targets))
+
+    # 여러 병원에 연결된 페이지는 한 번만
+    new_updates = {}
+    for entries in index.values():
+        for page_id, new_prop in entries:
+            new_updates[page_id] = {new_prop: {"checkbox": False}}
+
+    # patch_page → 실패가 예외로 올라와 run_batch 집계에 반영됨
+    cleared = run_batch(
+        lambda item: patch_page(item[0], item[1]),
+        new_updates.items(),
+        label="NEW 체크 해제",
+    )
+    print("🧹 여론/후기 NEW 체크 해제 완료")
+
+    # NEW 해제 실패 페이지가 연결된 병원 → 알림 확인 체크 유지
+    not_cleared = {page_id for (page_id, _), ok, _ in cleared if not ok}
+    unfinished |= {
+        hospital_id for hospital_id, entries in index.items()
+        if any(page_id in not_cleared for page_id, _ in entries)
+    }
+    if failed_dbs:
+        # 어느 병원의 NEW 가 남았는지 알 수 없음 → 전부 유지
+        print("⚠️ 조회 실패 DB 있음 → 알림 확인 체크 전부 유지:", failed_dbs)
+        unfinished |= set(targets)
+
+    # =========================
+    # C. 병원 알림 확인 체크 해제
+    # =========================
+    if unfinished:
+        print(f"⚠️ 알림 정리 미완료 병원 {len(unfinished)}곳 → 알림 확인 체크 유지")
+    run_batch(
+        lambda hospital_id: patch_page(
+            hospital_id, {HOSPITAL_CONFIRM_PROP: {"checkbox": False}}
+        ),
+        [h for h in targets if h not in unfinished],
+        label="알림 확인 체크 해제",
+    )
+    print("☑ 알림 확인 체크 해제 완료")
 
     print(f"\n{PRINT_PREFIX} notify_confirmed_alerts END")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -3,7 +3,6 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from datetime import datetime, timezone
-import time
 import warnings
 from urllib3.exceptions import NotOpenSSLWarning
 warnings.filterwarnings("ignore", category=NotOpenSSLWarning)
@@ -11,13 +10,16 @@ warnings.filterwarnings("ignore", category=NotOpenSSLWarning)
 from config.notion_mapping import NOTION_DBS
 from notion.client import (
     query_database,
-    update_page,
-    retrieve_page,
-    retrieve_page_blocks,
-    append_link_block_to_block,
+    retrieve_page_cached,
+    retrieve_page_blocks_cached,
+    append_children,
+    build_link_paragraph,
 )
+from notion import cache
+from notion.batch import run_batch
+from notion.write_queue import WriteBehindQueue
+from notion.filters import checkbox_equals
 from notion.fetch import (
-    get_checkbox,
     get_url,
     get_rich_text,
     get_relation_page_ids,
@@ -25,24 +27,84 @@ from notion.fetch import (
     get_rollup_people_names,
 )
 
-RATE_LIMIT_SLEEP = 0.3
-
 
 def find_callout_block_id(page_id: str) -> str | None:
     """
     병원 페이지에서 첫 번째 callout 블록 id 찾기
+    (같은 병원의 NEW 글이 여러 개여도 블록 조회는 1회 → 캐시)
     """
-    blocks = retrieve_page_blocks(page_id)
+    blocks = retrieve_page_blocks_cached(page_id)
     for b in blocks:
         if b.get("type") == "callout":
             return b["id"]
     return None
 
 
+def _collect_notification(page, cfg, now_text):
+    """
+    NEW 페이지 1개 → (callout_id, hospital_name, paragraph) / 스킵이면 None
+    """
+    page_id = page["id"]
+
+    # =========================
+    # 게시글 정보
+    # =========================
+    title = get_rich_text(page, "글 제목")
+    url = get_url(page, cfg["url"])
+
+    # =========================
+    # 병원 relation → 병원 페이지
+    # =========================
+    hospital_ids = get_relation_page_ids(page, cfg["hospital_relation"])
+    if not hospital_ids:
+        print("⚠️ 병원 relation 없음 → 스킵:", page_id)
+        return None
+
+    hospital_page_id = hospital_ids[0]
+
+    try:
+        hospital_page = retrieve_page_cached(hospital_page_id)
+    except Exception as e:
+        print("⚠️ 병원 페이지 로드 실패 → 스킵:", hospital_page_id, e)
+        return None
+
+    hospital_name = get_page_title(hospital_page) or "(병원명 없음)"
+
+    # =========================
+    # 담당자 (롤업)
+    # =========================
+    marketers = get_rollup_people_names(page, "작업자")
+    marketer_text = ", ".join(marketers) if marketers else "미지정"
+
+    print(
+        f"🏥 병원: {hospital_name} | "
+        f"[후기] 처리 중 → {page_id}"
+    )
+
+    # =========================
+    # Callout 블록 찾기
+    # =========================
+    callout_id = find_callout_block_id(hospital_page_id)
+    if not callout_id:
+        print("⚠️ Callout 블록 없음 → 스킵:", hospital_name)
+        return None
+
+    paragraph = build_link_paragraph(
+        title=f"[후기] {title or '(제목 없음)'}",
+        url=url,
+        time_text=f"{now_text} | 담당: {marketer_text}",
+    )
+    return callout_id, hospital_name, paragraph
+
+
 def main():
     print("🔔 notify_new_comments START (후기 전용)")
 
     total_new = 0
+    now_text = datetime.now(timezone.utc).astimezone().strftime("%Y-%m-%d %H:%M")
+
+    # callout_id → {"hospital", "children", "pages": [(page_id, new_prop), ...]}
+    groups = {}
 
     # =====================================================
     # ✅ 후기 DB만 알림 대상
@@ -51,98 +113,69 @@ def main():
         if "후기" not in name:
             continue   # ❌ 여론 완전 제외
 
-        label = "후기"
-
-        pages = query_database(cfg["database_id"])
-        new_pages = [p for p in pages if get_checkbox(p, cfg["new"])]
+        # 서버 필터로 NEW 페이지만 (DB 당 1회 조회, 롤업 값도 최신)
+        # 미러는 롤업이 낡을 수 있어 사용 ❌ (notion.mirror 참고)
+        new_pages = query_database(
+            cfg["database_id"], filter=checkbox_equals(cfg["new"], True)
+        )
 
         print(f"\n🔔 [{name}] NEW 페이지 수: {len(new_pages)}")
         total_new += len(new_pages)
 
         for page in new_pages:
-            page_id = page["id"]
-
             try:
-                # =========================
-                # 게시글 정보
-                # =========================
-                title = get_rich_text(page, "글 제목")
-                url = get_url(page, cfg["url"])
-
-                # =========================
-                # 병원 relation → 병원 페이지
-                # =========================
-                hospital_ids = get_relation_page_ids(page, cfg["hospital_relation"])
-                if not hospital_ids:
-                    print("⚠️ 병원 relation 없음 → 스킵:", page_id)
-                    continue
-
-                hospital_page_id = hospital_ids[0]
-
-                try:
-                    hospital_page = retrieve_page(hospital_page_id)
-                except Exception as e:
-                    print("⚠️ 병원 페이지 로드 실패 → 스킵:", hospital_page_id, e)
-                    continue
-
-                hospital_name = get_page_title(hospital_page) or "(병원명 없음)"
-
-                # =========================
-                # 담당자 (롤업)
-                # =========================
-                marketers = get_rollup_people_names(page, "작업자")
-                marketer_text = ", ".join(marketers) if marketers else "미지정"
-
-                print(
-                    f"🏥 병원: {hospital_name} | "
-                    f"[후기] 처리 중 → {page_id}"
-                )
-
-                # =========================
-                # Callout 블록 찾기
-                # =========================
-                callout_id = find_callout_block_id(hospital_page_id)
-                if not callout_id:
-                    print("⚠️ Callout 블록 없음 → 스킵:", hospital_name)
-                    continue
+                found = _collect_notification(page, cfg, now_text)
+            except Exception as e:
+                print("❌ notify 처리 실패:", page["id"], e)
+                continue
 
-                now_text = datetime.now(timezone.utc).astimezone().strftime(
-                    "%Y-%m-%d %H:%M"
-                )
+            if found is None:
+                continue
 
-                # =========================
-                # 🔔 알림 추가
-                # =========================
-                append_link_block_to_block(
-                    callout_id,
-                    title=f"[후기] {title or '(제목 없음)'}",
-                    url=url,
-                    time_text=f"{now_text} | 담당: {marketer_text}",
-                )
+            callout_id, hospital_name, paragraph = found
+            group = groups.setdefault(
+                callout_id, {"hospital": hospital_name, "children": [], "pages": []}
+            )
+            group["children"].append(paragraph)
+            group["pages"].append((page["id"], cfg["new"]))
 
-                print(f"✅ 알림 추가 완료 → {hospital_name} (담당: {marketer_text})")
+    if total_new == 0:
+        print("\n🔕 알림 대상 없음")
 
-                # =========================
-                # 🧹 NEW 체크 해제
-                # =========================
-                update_page(
-                    page_id,
-                    {cfg["new"]: {"checkbox": False}}
+    # =========================
+    # 🔔 병원 callout 별로 알림 한 번에 추가
+    # =========================
+    results = run_batch(
+        lambda item: append_children(item[0], item[1]["children"]),
+        groups.items(),
+        label="알림 추가",
+    )
+
+    # =========================
+    # 🧹 NEW 체크 해제 (알림이 추가된 병원만, write-behind 큐로 일괄)
+    # =========================
+    writer = WriteBehindQueue()
+    try:
+        for (callout_id, group), ok, value in results:
+            # children[i] ↔ pages[i] → 앞에서부터 추가된 만큼만 NEW 해제
+            appended = value if ok else getattr(value, "appended", 0)
+            if not ok:
+                print(
+                    f"❌ 알림 추가 실패 ({appended}/{len(group['children'])}건만 추가) "
+                    f"→ 나머지 NEW 유지:", group["hospital"], value
                 )
+            else:
+                print(f"✅ 알림 {appended}건 추가 완료 → {group['hospital']}")
 
-                print(f"🧹 NEW 체크 해제 완료 → {page_id}")
-
-                time.sleep(RATE_LIMIT_SLEEP)
-
-            except Exception as e:
-                print("❌ notify 처리 실패:", page_id, e)
-                continue
-
-    if total_new == 0:
-        print("\n🔕 알림 대상 없음")
+            for page_id, new_prop in group["pages"][:appended]:
+                writer.enqueue(page_id, {new_prop: {"checkbox": False}})
+    finally:
+        writer.close()
+        writer.report()
 
+    print("📦 Notion 캐시:", cache.metrics())
     print("\n🔔 notify_new_comments END")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
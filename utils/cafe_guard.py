@@ -4,30 +4,76 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
 }
 
-def is_cafe_post_accessible(url: str) -> bool:
-    if "cafe.naver.com" not in url:
-        return False
+# =========================
+# 접근 상태
+# =========================
+STATE_OK = "ok"
+STATE_BLOCKED = "blocked"
+STATE_DELETED = "deleted"
+STATE_UNAVAILABLE = "unavailable"   # 네트워크 오류 / 429 / 5xx → 일시적, 다음 실행에 재시도
+
+DELETED_KEYWORDS = [
+    "삭제되었거나 존재하지 않는 게시글",
+]
+BLOCK_KEYWORDS = [
+    "존재하지 않는 카페",
+    "접근이 제한된 카페",
+    "권한이 없습니다",
+]
 
+
+def fetch_page(url: str, timeout=5):
+    """
+    GET 결과 (status_code, text) / 요청 실패 시 None
+    (같은 글 재요청은 logic.dedup 의 실행 단위 크롤 결과 공유로 막음)
+    """
     try:
         res = requests.get(
             url,
             headers=HEADERS,
-            timeout=5,
+            timeout=timeout,
             allow_redirects=True
         )
+    except requests.RequestException:
+        return None
 
-        if res.status_code != 200:
-            return False
+    return res.status_code, res.text
 
-        text = res.text
-        BLOCK_KEYWORDS = [
-            "삭제되었거나 존재하지 않는 게시글",
-            "존재하지 않는 카페",
-            "접근이 제한된 카페",
-            "권한이 없습니다",
-        ]
 
-        return not any(k in text for k in BLOCK_KEYWORDS)
+def is_transient_status(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
 
-    except requests.RequestException:
-        return False
\ No newline at end of file
+
+def classify_cafe_response(status_code: int, text: str) -> str:
+    if is_transient_status(status_code):
+        return STATE_UNAVAILABLE
+
+    if status_code != 200:
+        return STATE_BLOCKED
+
+    if any(k in text for k in DELETED_KEYWORDS):
+        return STATE_DELETED
+
+    if any(k in text for k in BLOCK_KEYWORDS):
+        return STATE_BLOCKED
+
+    return STATE_OK
+
+
+def check_cafe_post(url: str) -> str:
+    """
+    카페 게시글 접근 상태 (ok / blocked / deleted / unavailable)
+    unavailable → 삭제/차단 여부를 알 수 없음 (요청 실패, 429, 5xx)
+    """
+    if "cafe.naver.com" not in url:
+        return STATE_BLOCKED
+
+    entry = fetch_page(url)
+    if entry is None:
+        return STATE_UNAVAILABLE
+
+    return classify_cafe_response(*entry)
+
+
+def is_cafe_post_accessible(url: str) -> bool:
+    return check_cafe_post(url) == STATE_OK
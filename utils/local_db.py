@@ -0,0 +1,62 @@
+import os
+import sqlite3
+import threading
+
+# 로컬 캐시/상태 저장용 SQLite (프로젝트 루트 기준 → 어디서 실행해도 같은 파일)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOCAL_DB_PATH = os.path.join(
+    PROJECT_ROOT, os.environ.get("LOCAL_DB_PATH", "local_cache.sqlite3")
+)
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+_applied_schemas = set()
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    스레드별 커넥션 (sqlite3 커넥션은 스레드 간 공유 ❌)
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(LOCAL_DB_PATH, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _local.conn = conn
+    return conn
+
+
+def ensure_schema(name: str, sql: str):
+    """
+    모듈별 테이블 생성 (프로세스당 1회)
+    """
+    if name in _applied_schemas:
+        return
+
+    with _schema_lock:
+        if name in _applied_schemas:
+            return
+        conn = get_connection()
+        conn.executescript(sql)
+        conn.commit()
+        _applied_schemas.add(name)
+
+
+def ensure_column(table: str, column: str, decl: str):
+    """
+    기존 DB 파일에 컬럼 추가 (이미 있으면 무시, 프로세스당 1회)
+    """
+    name = f"{table}.{column}"
+    if name in _applied_schemas:
+        return
+
+    with _schema_lock:
+        if name in _applied_schemas:
+            return
+        conn = get_connection()
+        columns = {r["name"] for r in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+            conn.commit()
+        _applied_schemas.add(name)